@@ -2,10 +2,13 @@
 用户相关 API 路由
 """
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
 from supabase import Client
 
 from app.core.supabase import get_supabase_service
+from app.core.redis import get_redis
+from app.core.postgres import get_pool
 from app.api.dependencies.auth import get_current_user_id, get_current_user_email, get_optional_user_id
 from app.services.user_service import UserService
 from app.schemas.user import (
@@ -18,14 +21,23 @@ from app.schemas.user import (
     UserFollowResponse,
     FollowStatusResponse,
     FollowListResponse,
+    FollowUserInfo,
 )
 
-router = APIRouter(prefix="/users", tags=["users"])
+# 用户路由只返回 Pydantic 模型和基础类型，统一使用 orjson 序列化
+router = APIRouter(
+    prefix="/users", tags=["users"], default_response_class=ORJSONResponse
+)
 
 
 def get_user_service(supabase: Client = Depends(get_supabase_service)) -> UserService:
-    """获取用户服务实例（使用 service client 绕过 RLS）"""
-    return UserService(supabase)
+    """
+    获取用户服务实例
+
+    使用 service client 绕过 RLS；配置 Redis 时共享资料缓存，
+    配置 Postgres 连接池时热点读路径直连数据库
+    """
+    return UserService(supabase, get_redis(), get_pool())
 
 
 @router.get("/me", response_model=UserProfileResponse, summary="获取当前用户资料")
@@ -155,9 +167,11 @@ async def create_user_profile(
     include_in_schema=False  # 暂时不在文档中显示
 )
 async def list_users(
-    page: int = Query(1, ge=1, description="页码"),
+    page: int = Query(1, ge=1, description="页码（传 cursor 时忽略）"),
     page_size: int = Query(50, ge=1, le=100, description="每页数量"),
     search: Optional[str] = Query(None, description="搜索关键词"),
+    exact: bool = Query(False, description="是否返回精确总数（默认为估算值）"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
     current_user_id: str = Depends(get_current_user_id),
     user_service: UserService = Depends(get_user_service),
 ):
@@ -167,9 +181,14 @@ async def list_users(
     需要认证：Bearer token
     需要权限：管理员
     
+    total 默认为 Postgres 查询计划的估算值，需要精确值时传 exact=true
+    
+    翻页时优先传 cursor（keyset 分页），page 仅用于跳页；
+    传 cursor 时忽略 page，响应中的 page 为 null
+    
     TODO: 添加管理员权限检查
     """
-    return await user_service.list_users(page, page_size, search)
+    return await user_service.list_users(page, page_size, search, exact, cursor)
 
 
 # ===== Follow 相关路由 =====
@@ -292,5 +311,26 @@ async def batch_check_follow_status(
     Returns:
         Dict[str, bool]: 用户ID到是否关注的映射
     """
-    return await user_service.check_batch_following(current_user_id, user_ids)
+    followed = await user_service.check_batch_following(current_user_id, user_ids)
+    return {uid: uid in followed for uid in user_ids}
+
+
+@router.post(
+    "/batch-profiles", response_model=List[FollowUserInfo], summary="批量获取用户资料及关注状态"
+)
+async def batch_get_profiles(
+    user_ids: List[str] = Query(..., description="用户ID列表"),
+    current_user_id: Optional[str] = Depends(get_optional_user_id),
+    user_service: UserService = Depends(get_user_service),
+):
+    """
+    批量获取用户基本资料，并附带当前用户是否关注
+
+    可选认证：Bearer token（用于判断当前用户是否关注这些用户）
+
+    与 /batch-follow-status 不同，资料和关注状态在一次查询中返回
 
+    Args:
+        user_ids: 要获取的用户ID列表
+    """
+    return await user_service.get_profiles_with_follow_flags(current_user_id, user_ids)
@@ -3,6 +3,7 @@
 提供爬虫状态检查和数据库统计功能
 """
 
+from collections import Counter
 from fastapi import APIRouter, HTTPException
 from typing import Dict
 from datetime import datetime, timezone, timedelta
@@ -130,11 +131,12 @@ def get_database_stats():
             .select("ai_sentiment")
             .execute()
         )
-        sentiment_counts = {}
-        for post in sentiment_result.data:
-            sentiment = post.get("ai_sentiment") or "未分析"
-            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-        stats["by_sentiment"] = sentiment_counts
+        stats["by_sentiment"] = dict(
+            Counter(
+                post.get("ai_sentiment") or "未分析"
+                for post in sentiment_result.data
+            )
+        )
     except Exception:
         stats["by_sentiment"] = {}
 
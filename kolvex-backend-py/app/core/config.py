@@ -23,6 +23,14 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     SUPABASE_SERVICE_KEY: str = ""
+    # Supabase Postgres 直连地址（可选，配置后热点读路径使用 asyncpg）
+    SUPABASE_DB_URL: str = ""
+
+    # Redis 配置（可选，用于跨进程缓存；留空则使用进程内缓存）
+    REDIS_URL: str = ""
+
+    # 阻塞调用线程池大小（同步 Supabase 客户端通过 asyncio.to_thread 在此执行）
+    THREAD_POOL_WORKERS: int = 50
 
     # JWT 配置
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
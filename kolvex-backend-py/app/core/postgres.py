@@ -0,0 +1,64 @@
+"""
+Postgres 直连连接池（可选）
+
+用于绕过 PostgREST 的热点读路径。未配置 SUPABASE_DB_URL 或未安装 asyncpg 时
+get_pool() 返回 None，调用方应回退到 Supabase 客户端
+"""
+import logging
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import asyncpg
+
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresPool:
+    """asyncpg 连接池单例（在应用 lifespan 中创建和关闭）"""
+
+    _pool: Optional["asyncpg.Pool"] = None
+
+    @classmethod
+    async def init_pool(cls) -> None:
+        """创建连接池，未配置时跳过"""
+        if cls._pool is not None:
+            return
+        if not ASYNCPG_AVAILABLE or not settings.SUPABASE_DB_URL:
+            return
+
+        try:
+            # 使用直连或 session 模式的 pooler 地址；transaction 模式不支持 prepared statement
+            cls._pool = await asyncpg.create_pool(
+                settings.SUPABASE_DB_URL,
+                min_size=10,
+                max_size=50,
+                max_inactive_connection_lifetime=300,
+            )
+            logger.info("✅ Postgres 连接池已创建")
+        except Exception as e:
+            logger.warning(f"⚠️ Postgres 连接池创建失败，将使用 Supabase 客户端: {e}")
+            cls._pool = None
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """关闭连接池"""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    @classmethod
+    def get_pool(cls) -> Optional["asyncpg.Pool"]:
+        """获取连接池，未创建时返回 None"""
+        return cls._pool
+
+
+def get_pool() -> Optional["asyncpg.Pool"]:
+    """获取 Postgres 连接池（未配置时为 None）"""
+    return PostgresPool.get_pool()
@@ -0,0 +1,44 @@
+"""
+Redis 配置和客户端（可选）
+
+未配置 REDIS_URL 或未安装 redis 包时，get_redis() 返回 None，
+调用方应回退到进程内缓存
+"""
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    from redis.asyncio import Redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    Redis = None
+
+
+class RedisClient:
+    """Redis 客户端单例"""
+
+    _instance: Optional["Redis"] = None
+
+    @classmethod
+    def get_client(cls) -> Optional["Redis"]:
+        """获取 Redis 客户端实例，未配置时返回 None"""
+        if cls._instance is None:
+            if not REDIS_AVAILABLE or not settings.REDIS_URL:
+                return None
+
+            cls._instance = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+        return cls._instance
+
+    @classmethod
+    def reset_client(cls):
+        """重置客户端（用于测试）"""
+        cls._instance = None
+
+
+def get_redis() -> Optional["Redis"]:
+    """获取 Redis 客户端（未配置时为 None）"""
+    return RedisClient.get_client()
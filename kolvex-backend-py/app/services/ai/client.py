@@ -167,10 +167,10 @@ class OllamaClientSync:
             data = response.json()
             return data.get("response", "")
 
-    def health_check(self) -> bool:
+    def health_check(self, timeout: float = 10.0) -> bool:
         """健康检查"""
         try:
-            with httpx.Client(timeout=10.0) as client:
+            with httpx.Client(timeout=timeout) as client:
                 response = client.get(f"{self.base_url}/api/tags")
                 return response.status_code == 200
         except Exception:
@@ -2,8 +2,6 @@
 CLI 命令行入口
 """
 
-import argparse
-
 from .scraper import BatchKOLScraper
 from .database import get_supabase_client, get_stats
 from .migration import migrate_sqlite_to_supabase
@@ -11,6 +9,9 @@ from .migration import migrate_sqlite_to_supabase
 
 def main():
     """命令行入口"""
+    # argparse 仅在 CLI 运行时需要，避免随包导入时加载
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="美股 KOL 批量爬虫 (Supabase 版)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
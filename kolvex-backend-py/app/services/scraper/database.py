@@ -19,14 +19,21 @@ except ImportError:
 
 from .config import DEFAULT_TWEET_MAX_AGE_DAYS
 
+# 进程内复用的 Supabase 客户端（API 路由每次请求都会调用 get_supabase_client）
+_client: Optional[Client] = None
+
 
 def get_supabase_client() -> Optional[Client]:
     """
-    获取 Supabase 客户端
+    获取 Supabase 客户端（首次创建后复用）
 
     Returns:
         Optional[Client]: Supabase 客户端，如果未配置返回 None
     """
+    global _client
+    if _client is not None:
+        return _client
+
     if not SUPABASE_AVAILABLE:
         print("⚠️ Supabase 未安装，请运行: pip install supabase")
         return None
@@ -45,7 +52,8 @@ def get_supabase_client() -> Optional[Client]:
         )
         return None
 
-    return create_client(supabase_url, supabase_key)
+    _client = create_client(supabase_url, supabase_key)
+    return _client
 
 
 def compute_tweet_hash(text: str, username: str) -> str:
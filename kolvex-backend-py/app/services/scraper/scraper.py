@@ -199,7 +199,7 @@ class BatchKOLScraper:
         Returns:
             List[Dict]: 爬取到的推文列表
         """
-        clean_username = username.lstrip("@").strip()
+        clean_username = username.strip().removeprefix("@")
         profile_url = f"https://x.com/{clean_username}"
 
         # 使用搜索 URL 并按时间排序（f=live 表示最新）
@@ -10,6 +10,9 @@ from datetime import datetime
 from supabase import Client
 
 from app.core.supabase import get_supabase_service
+from app.core.redis import get_redis
+from app.core.postgres import get_pool
+from app.services.user_service import UserService
 from .client import SnapTradeClient, get_snaptrade_client
 from app.services.notification_service import NotificationService, get_notification_service
 
@@ -748,6 +751,11 @@ class SnapTradeService:
             "hidden_accounts": [],
         }
 
+        # 批量获取用户资料（走用户资料缓存，未命中的一次查询），避免在循环中逐个查询
+        profile_map = await UserService(
+            self.supabase, get_redis(), get_pool()
+        ).get_user_profiles_bulk([conn["user_id"] for conn in result.data])
+
         # 获取用户详细信息和持仓汇总
         users = []
         for conn in result.data:
@@ -757,13 +765,7 @@ class SnapTradeService:
             privacy = {**default_privacy, **(conn.get("privacy_settings") or {})}
 
             # 获取用户资料
-            profile = (
-                self.supabase.table("user_profiles")
-                .select("username, full_name, avatar_url")
-                .eq("id", user_id)
-                .single()
-                .execute()
-            )
+            profile = profile_map.get(user_id)
 
             # 获取持仓汇总
             connection = (
@@ -827,9 +829,9 @@ class SnapTradeService:
             # 根据隐私设置决定返回的字段
             user_data = {
                 "user_id": user_id,
-                "username": profile.data.get("username") if profile.data else None,
-                "full_name": profile.data.get("full_name") if profile.data else None,
-                "avatar_url": profile.data.get("avatar_url") if profile.data else None,
+                "username": profile.username if profile else None,
+                "full_name": profile.full_name if profile else None,
+                "avatar_url": profile.avatar_url if profile else None,
                 "last_synced_at": conn.get("last_synced_at"),
                 "total_value": total_value if privacy.get("show_total_value") else None,
                 "total_pnl": total_pnl if privacy.get("show_total_pnl") else None,
@@ -2,8 +2,15 @@
 用户服务 - 处理用户 Profile 相关业务逻辑
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime
+from uuid import UUID
+from typing import Optional, Dict, Any, List, FrozenSet, Tuple
 from supabase import Client
+from postgrest.exceptions import APIError
 from app.schemas.user import (
     UserProfileCreate,
     UserProfileUpdate,
@@ -15,14 +22,208 @@ from app.schemas.user import (
     FollowListResponse,
     FollowUserInfo,
 )
+from app.core.postgres import asyncpg
+from app.core.redis import Redis
+from app.utils.cache import TTLCache
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+
+# UserProfileResponse 需要的列，避免 select("*") 拉取无关字段
+# 直接由模型字段生成，新增字段时无需同步修改
+PROFILE_COLUMNS = ", ".join(UserProfileResponse.model_fields)
+
+# list_users 搜索关键词中需要去掉的字符：LIKE/PostgREST 通配符以及引号、反斜杠
+_SEARCH_STRIP_CHARS = str.maketrans("", "", '%*"\\')
+
+# 列表校验一次性交给 pydantic-core，避免逐行构造模型
+_PROFILE_LIST_ADAPTER = TypeAdapter(List[UserProfileResponse])
+_FOLLOW_USER_LIST_ADAPTER = TypeAdapter(List[FollowUserInfo])
+
+logger = logging.getLogger(__name__)
+
+# 用户资料缓存（user_id -> 原始行数据）
+# 配置了 Redis 时使用 Redis（跨进程共享），否则使用进程内缓存，两者使用同一个 TTL
+# UserService 的更新操作写入最新行，删除操作使其失效；
+# 绕过 UserService 直接写 user_profiles 的改动（SQL、控制台、其他服务）
+# 最多滞后 PROFILE_CACHE_TTL 秒可见，新增此类写入时应调用 _invalidate_profile
+PROFILE_CACHE_TTL = 60
+PROFILE_CACHE_PREFIX = "user:profile:"
+_profile_cache = TTLCache(maxsize=10_000, ttl=PROFILE_CACHE_TTL)
+
+# 邮箱 -> user_id 映射缓存（认证流程中按邮箱查询非常频繁）
+# 只缓存映射，资料本身仍取自上面的资料缓存；命中后校验邮箱，
+# 邮箱被修改时旧映射会因校验失败自动作废
+EMAIL_CACHE_PREFIX = "user:profile:email:"
+_email_cache = TTLCache(maxsize=10_000, ttl=PROFILE_CACHE_TTL)
+
+# list_users 无搜索条件时的精确总数缓存
+USER_COUNT_CACHE_TTL = 30
+_user_count_cache = TTLCache(maxsize=1, ttl=USER_COUNT_CACHE_TTL)
+
+
+def _encode_cursor(created_at: str, row_id: str) -> str:
+    """把最后一行的 (created_at, id) 编码为不透明的分页游标"""
+    return base64.urlsafe_b64encode(f"{created_at}|{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    解析分页游标，格式不合法时返回 400
+
+    两部分都会校验格式，避免构造的游标向 or 过滤条件中注入语法
+    """
+    try:
+        created_at, sep, row_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().rpartition("|")
+        )
+        if not sep:
+            raise ValueError("missing separator")
+        datetime.fromisoformat(created_at)
+        UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor"
+        )
+    return created_at, row_id
 
 
 class UserService:
     """用户服务类"""
 
-    def __init__(self, supabase: Client):
+    def __init__(
+        self,
+        supabase: Client,
+        redis: Optional["Redis"] = None,
+        pool: Optional["asyncpg.Pool"] = None,
+    ):
         self.supabase = supabase
+        self.redis = redis
+        # 配置了直连连接池时，热点读路径绕过 PostgREST
+        self.pool = pool
+
+    @staticmethod
+    async def _execute(query) -> Any:
+        """
+        在线程池中执行 Supabase 查询
+
+        supabase-py 的同步 Client 在 execute() 时会阻塞当前线程，
+        直接在协程中调用会卡住事件循环，这里统一交给 asyncio.to_thread
+        """
+        return await asyncio.to_thread(query.execute)
+
+    @staticmethod
+    def _record_to_row(record) -> Dict[str, Any]:
+        """把 asyncpg Record 转成与 PostgREST 返回一致的 JSON 兼容 dict"""
+        row = dict(record)
+        for key, value in row.items():
+            if isinstance(value, UUID):
+                row[key] = str(value)
+            elif isinstance(value, datetime):
+                row[key] = value.isoformat()
+        return row
+
+    async def _get_cached_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """读取资料缓存，Redis 出错时视为未命中"""
+        if self.redis is None:
+            return _profile_cache.get(user_id)
+
+        try:
+            raw = await self.redis.get(f"{PROFILE_CACHE_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"读取资料缓存失败: {e}")
+            return None
+
+        return json.loads(raw) if raw else None
+
+    async def _cache_profile(self, user_id: str, row: Dict[str, Any]) -> None:
+        """写入资料缓存（write-through）"""
+        if self.redis is None:
+            _profile_cache.set(user_id, row)
+            return
+
+        try:
+            await self.redis.set(
+                f"{PROFILE_CACHE_PREFIX}{user_id}",
+                json.dumps(row),
+                ex=PROFILE_CACHE_TTL,
+            )
+        except Exception as e:
+            logger.warning(f"写入资料缓存失败: {e}")
+
+    async def _get_cached_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量读取资料缓存（Redis 使用一次 MGET），出错时视为全部未命中"""
+        if self.redis is None:
+            cached = {user_id: _profile_cache.get(user_id) for user_id in user_ids}
+            return {user_id: row for user_id, row in cached.items() if row is not None}
+
+        try:
+            raws = await self.redis.mget(
+                [f"{PROFILE_CACHE_PREFIX}{user_id}" for user_id in user_ids]
+            )
+        except Exception as e:
+            logger.warning(f"读取资料缓存失败: {e}")
+            return {}
+
+        return {
+            user_id: json.loads(raw) for user_id, raw in zip(user_ids, raws) if raw
+        }
+
+    async def _cache_profiles(self, rows: List[Dict[str, Any]]) -> None:
+        """批量写入资料缓存（Redis 使用一次 pipeline）"""
+        if not rows:
+            return
+
+        if self.redis is None:
+            for row in rows:
+                _profile_cache.set(row["id"], row)
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for row in rows:
+                    pipe.set(
+                        f"{PROFILE_CACHE_PREFIX}{row['id']}",
+                        json.dumps(row),
+                        ex=PROFILE_CACHE_TTL,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"写入资料缓存失败: {e}")
+
+    async def _invalidate_profile(self, user_id: str) -> None:
+        """使资料缓存失效"""
+        if self.redis is None:
+            _profile_cache.pop(user_id)
+            return
+
+        try:
+            await self.redis.delete(f"{PROFILE_CACHE_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"删除资料缓存失败: {e}")
+
+    async def _get_cached_user_id_by_email(self, email: str) -> Optional[str]:
+        """读取邮箱映射缓存，Redis 出错时视为未命中"""
+        if self.redis is None:
+            return _email_cache.get(email)
+
+        try:
+            return await self.redis.get(f"{EMAIL_CACHE_PREFIX}{email}")
+        except Exception as e:
+            logger.warning(f"读取邮箱缓存失败: {e}")
+            return None
+
+    async def _cache_email(self, email: str, user_id: str) -> None:
+        """写入邮箱映射缓存"""
+        if self.redis is None:
+            _email_cache.set(email, user_id)
+            return
+
+        try:
+            await self.redis.set(
+                f"{EMAIL_CACHE_PREFIX}{email}", user_id, ex=PROFILE_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"写入邮箱缓存失败: {e}")
 
     async def get_user_profile(self, user_id: str) -> UserProfileResponse:
         """
@@ -37,30 +238,73 @@ class UserService:
         Raises:
             HTTPException: 404 如果用户不存在
         """
-        try:
-            response = (
+        cached = await self._get_cached_profile(user_id)
+        if cached is not None:
+            return UserProfileResponse.model_validate(cached)
+
+        if self.pool is not None:
+            record = await self.pool.fetchrow(
+                f"SELECT {PROFILE_COLUMNS} FROM user_profiles WHERE id = $1", user_id
+            )
+            row = self._record_to_row(record) if record else None
+        else:
+            response = await self._execute(
                 self.supabase.table("user_profiles")
-                .select("*")
+                .select(PROFILE_COLUMNS)
                 .eq("id", user_id)
-                .single()
-                .execute()
+                .maybe_single()
             )
+            row = response.data if response is not None else None
 
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="user profile not found",
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="user profile not found",
+            )
+
+        await self._cache_profile(user_id, row)
+        return UserProfileResponse.model_validate(row)
+
+    async def get_user_profiles_bulk(
+        self, user_ids: List[str]
+    ) -> Dict[str, UserProfileResponse]:
+        """
+        批量获取用户资料（先读缓存，未命中的用户一次 in_ 查询）
+
+        Args:
+            user_ids: 用户 ID 列表
+
+        Returns:
+            Dict[str, UserProfileResponse]: 用户 ID 到资料的映射，不存在的用户不包含在内
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+
+        rows_by_id = await self._get_cached_profiles(user_ids)
+        missing = [user_id for user_id in user_ids if user_id not in rows_by_id]
+
+        if missing:
+            if self.pool is not None:
+                records = await self.pool.fetch(
+                    f"SELECT {PROFILE_COLUMNS} FROM user_profiles "
+                    "WHERE id = ANY($1::uuid[])",
+                    missing,
+                )
+                rows = [self._record_to_row(record) for record in records]
+            else:
+                response = await self._execute(
+                    self.supabase.table("user_profiles")
+                    .select(PROFILE_COLUMNS)
+                    .in_("id", missing)
                 )
+                rows = response.data or []
 
-            return UserProfileResponse(**response.data)
+            await self._cache_profiles(rows)
+            rows_by_id.update((row["id"], row) for row in rows)
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get user profile error: {str(e)}",
-            )
+        profiles = _PROFILE_LIST_ADAPTER.validate_python(list(rows_by_id.values()))
+        return {profile.id: profile for profile in profiles}
 
     async def get_user_profile_by_email(
         self, email: str
@@ -74,28 +318,39 @@ class UserService:
         Returns:
             Optional[UserProfileResponse]: 用户资料或 None
         """
-        try:
-            response = (
+        user_id = await self._get_cached_user_id_by_email(email)
+        if user_id:
+            row = await self._get_cached_profile(user_id)
+            if row and row.get("email") == email:
+                return UserProfileResponse.model_validate(row)
+
+        if self.pool is not None:
+            record = await self.pool.fetchrow(
+                f"SELECT {PROFILE_COLUMNS} FROM user_profiles WHERE email = $1", email
+            )
+            row = self._record_to_row(record) if record else None
+        else:
+            # maybe_single() 在无结果时返回空数据而不是抛异常
+            response = await self._execute(
                 self.supabase.table("user_profiles")
-                .select("*")
+                .select(PROFILE_COLUMNS)
                 .eq("email", email)
-                .single()
-                .execute()
+                .maybe_single()
             )
+            row = response.data if response is not None else None
 
-            if not response.data:
-                return None
-
-            return UserProfileResponse(**response.data)
-
-        except Exception:
+        if not row:
             return None
 
+        await self._cache_profile(row["id"], row)
+        await self._cache_email(email, row["id"])
+        return UserProfileResponse.model_validate(row)
+
     async def create_user_profile(
         self, user_id: str, profile_data: UserProfileCreate
     ) -> UserProfileResponse:
         """
-        创建用户资料（通常在用户注册后自动调用）
+        创建用户资料（通常在用户注册后自动调用，已存在时更新提供的字段）
 
         Args:
             user_id: 用户 ID（来自 Supabase Auth）
@@ -107,36 +362,24 @@ class UserService:
         Raises:
             HTTPException: 400 如果创建失败
         """
-        try:
-            # 准备插入数据
-            insert_data = {
-                "id": user_id,
-                "email": profile_data.email,
-                "username": profile_data.username,
-                "full_name": profile_data.full_name,
-                "avatar_url": profile_data.avatar_url,
-            }
-
-            response = (
-                self.supabase.table("user_profiles").insert(insert_data).execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="create user profile error",
-                )
+        # 准备插入数据（未提供的字段交给数据库默认值）
+        insert_data = {"id": user_id, **profile_data.model_dump(exclude_none=True)}
 
-            return UserProfileResponse(**response.data[0])
+        # upsert 保证注册重试幂等（资料可能已由 trigger 创建），
+        # 写入后的行通过 RETURNING 一并返回
+        response = await self._execute(
+            self.supabase.table("user_profiles").upsert(insert_data, on_conflict="id")
+        )
 
-        except HTTPException:
-            raise
-        except Exception as e:
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"create user profile error: {str(e)}",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="create user profile error",
             )
 
+        await self._cache_profile(user_id, response.data[0])
+        return UserProfileResponse.model_validate(response.data[0])
+
     async def update_user_profile(
         self, user_id: str, profile_update: UserProfileUpdate
     ) -> UserProfileResponse:
@@ -153,37 +396,28 @@ class UserService:
         Raises:
             HTTPException: 404 如果用户不存在，400 如果更新失败
         """
-        try:
-            # 只更新提供的字段
-            update_data = profile_update.model_dump(exclude_unset=True)
+        # 只更新提供的字段
+        update_data = profile_update.model_dump(exclude_unset=True)
 
-            if not update_data:
-                # 如果没有要更新的数据，直接返回当前资料
-                return await self.get_user_profile(user_id)
+        if not update_data:
+            # 如果没有要更新的数据，直接返回当前资料（通常命中缓存，不查库）
+            return await self.get_user_profile(user_id)
 
-            response = (
-                self.supabase.table("user_profiles")
-                .update(update_data)
-                .eq("id", user_id)
-                .execute()
-            )
+        response = await self._execute(
+            self.supabase.table("user_profiles")
+            .update(update_data)
+            .eq("id", user_id)
+        )
 
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="user profile not found",
-                )
-
-            return UserProfileResponse(**response.data[0])
-
-        except HTTPException:
-            raise
-        except Exception as e:
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"update user profile error: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="user profile not found",
             )
 
+        await self._cache_profile(user_id, response.data[0])
+        return UserProfileResponse.model_validate(response.data[0])
+
     async def update_user_theme(
         self, user_id: str, theme_update: UserThemeUpdate
     ) -> UserProfileResponse:
@@ -197,31 +431,22 @@ class UserService:
         Returns:
             UserProfileResponse: 更新后的用户资料
         """
-        try:
-            # theme_update.theme 已经是字符串（因为 use_enum_values=True）
-            response = (
-                self.supabase.table("user_profiles")
-                .update({"theme": theme_update.theme})
-                .eq("id", user_id)
-                .execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="user profile not found",
-                )
-
-            return UserProfileResponse(**response.data[0])
-
-        except HTTPException:
-            raise
-        except Exception as e:
+        # theme_update.theme 已经是字符串（因为 use_enum_values=True）
+        response = await self._execute(
+            self.supabase.table("user_profiles")
+            .update({"theme": theme_update.theme})
+            .eq("id", user_id)
+        )
+
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"update user theme error: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="user profile not found",
             )
 
+        await self._cache_profile(user_id, response.data[0])
+        return UserProfileResponse.model_validate(response.data[0])
+
     async def update_user_notification(
         self, user_id: str, notification_update: UserNotificationUpdate
     ) -> UserProfileResponse:
@@ -235,35 +460,27 @@ class UserService:
         Returns:
             UserProfileResponse: 更新后的用户资料
         """
-        try:
-            update_data = notification_update.model_dump(exclude_unset=True)
-
-            if not update_data:
-                return await self.get_user_profile(user_id)
+        update_data = notification_update.model_dump(exclude_unset=True)
 
-            response = (
-                self.supabase.table("user_profiles")
-                .update(update_data)
-                .eq("id", user_id)
-                .execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="user profile not found",
-                )
+        if not update_data:
+            # 同上，无更新字段时走缓存返回当前资料
+            return await self.get_user_profile(user_id)
 
-            return UserProfileResponse(**response.data[0])
+        response = await self._execute(
+            self.supabase.table("user_profiles")
+            .update(update_data)
+            .eq("id", user_id)
+        )
 
-        except HTTPException:
-            raise
-        except Exception as e:
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"update notification settings error: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="user profile not found",
             )
 
+        await self._cache_profile(user_id, response.data[0])
+        return UserProfileResponse.model_validate(response.data[0])
+
     async def delete_user_profile(self, user_id: str) -> Dict[str, Any]:
         """
         删除用户资料（软删除或硬删除）
@@ -277,82 +494,132 @@ class UserService:
         Raises:
             HTTPException: 404 如果用户不存在
         """
-        try:
-            # 注意：这会硬删除用户资料
-            # 如果需要软删除，可以添加一个 deleted_at 字段
-            response = (
-                self.supabase.table("user_profiles")
-                .delete()
-                .eq("id", user_id)
-                .execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="user profile not found",
-                )
-
-            return {
-                "success": True,
-                "message": "user profile deleted",
-                "user_id": user_id,
-            }
-
-        except HTTPException:
-            raise
-        except Exception as e:
+        # 注意：这会硬删除用户资料
+        # 如果需要软删除，可以添加一个 deleted_at 字段
+        response = await self._execute(
+            self.supabase.table("user_profiles")
+            .delete()
+            .eq("id", user_id)
+        )
+
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"delete user profile error: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="user profile not found",
             )
 
+        await self._invalidate_profile(user_id)
+        return {
+            "success": True,
+            "message": "user profile deleted",
+            "user_id": user_id,
+        }
+
     async def list_users(
-        self, page: int = 1, page_size: int = 50, search: Optional[str] = None
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        search: Optional[str] = None,
+        exact_count: bool = False,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         获取用户列表（管理员功能）
 
+        按 (created_at, id) 倒序返回。传入 cursor 时使用 keyset 分页（忽略 page，返回的 page 为 None），
+        避免大页码下 OFFSET 扫描并丢弃前面的行
+
         Args:
-            page: 页码（从 1 开始）
+            page: 页码（从 1 开始，仅在未传 cursor 时使用）
             page_size: 每页数量
             search: 搜索关键词（搜索邮箱或用户名）
+            exact_count: 是否返回精确总数；默认使用查询计划估算值，避免每页 COUNT(*)
+            cursor: 上一页返回的 next_cursor
 
         Returns:
-            Dict: 包含用户列表和分页信息
+            Dict: 包含用户列表、分页信息（total 默认为估算值；游标分页时 page 为 None）和 next_cursor
         """
-        try:
-            # 计算偏移量
+        # 如果有搜索关键词（由 pg_trgm GIN 索引支持）
+        term = search.translate(_SEARCH_STRIP_CHARS).strip() if search else ""
+        search_filter = None
+        if term:
+            # 用双引号包裹，避免关键词中的 , ( ) 破坏 or 过滤语法
+            pattern = f'"%{term}%"'
+            search_filter = f"email.ilike.{pattern},username.ilike.{pattern}"
+
+        # 构建查询；精确总数单独查询，避免 COUNT 拖慢分页查询本身
+        query = self.supabase.table("user_profiles").select(
+            PROFILE_COLUMNS, count=None if exact_count else "planned"
+        )
+        if search_filter:
+            query = query.or_(search_filter)
+
+        query = query.order("created_at", desc=True).order("id", desc=True)
+
+        if cursor:
+            # (created_at, id) 严格小于游标行，created_at 相同的行按 id 继续，不会被跳过
+            created_at, row_id = _decode_cursor(cursor)
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+            ).limit(page_size)
+        else:
             offset = (page - 1) * page_size
+            query = query.range(offset, offset + page_size - 1)
+
+        # 执行查询（需要精确总数时与 COUNT 查询并行）
+        if exact_count:
+            response, total = await asyncio.gather(
+                self._execute(query), self._count_users(search_filter)
+            )
+        else:
+            response = await self._execute(query)
+            total = response.count or 0
+
+        rows = response.data or []
+        users = _PROFILE_LIST_ADAPTER.validate_python(rows)
+
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        return {
+            "users": users,
+            "total": total,
+            # 游标分页没有页码概念
+            "page": None if cursor else page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+        }
+
+    async def _count_users(self, search_filter: Optional[str] = None) -> int:
+        """
+        精确统计用户数
 
-            # 构建查询
-            query = self.supabase.table("user_profiles").select("*", count="exact")
+        无搜索条件时的总数在进程内缓存 USER_COUNT_CACHE_TTL 秒，
+        管理后台可以接受略微滞后的总数
 
-            # 如果有搜索关键词
-            if search:
-                query = query.or_(f"email.ilike.%{search}%,username.ilike.%{search}%")
+        Args:
+            search_filter: list_users 构建的 or 过滤条件
 
-            # 执行查询
-            response = query.range(offset, offset + page_size - 1).execute()
+        Returns:
+            int: 用户数
+        """
+        if search_filter is None:
+            cached = _user_count_cache.get("total")
+            if cached is not None:
+                return cached
 
-            users = (
-                [UserProfileResponse(**user) for user in response.data]
-                if response.data
-                else []
-            )
+        query = self.supabase.table("user_profiles").select("id", count="exact")
+        if search_filter:
+            query = query.or_(search_filter)
 
-            return {
-                "users": users,
-                "total": response.count or 0,
-                "page": page,
-                "page_size": page_size,
-            }
+        response = await self._execute(query.limit(1))
+        total = response.count or 0
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get users list error: {str(e)}",
-            )
+        if search_filter is None:
+            _user_count_cache.set("total", total)
+        return total
 
     # ===== Follow 相关方法 =====
 
@@ -378,57 +645,33 @@ class UserService:
             )
 
         try:
-            # 检查是否已经关注
-            existing = (
-                self.supabase.table("user_follows")
-                .select("*")
-                .eq("follower_id", follower_id)
-                .eq("following_id", following_id)
-                .execute()
+            # 存在性检查与插入在数据库函数 follow_user_safe 中一次完成
+            response = await self._execute(
+                self.supabase.rpc(
+                    "follow_user_safe", {"f": follower_id, "t": following_id}
+                )
             )
-
-            if existing.data:
+        except APIError as e:
+            if e.code == "23505":
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="already follow this user",
                 )
-
-            # 检查被关注用户是否存在
-            target_user = (
-                self.supabase.table("user_profiles")
-                .select("id")
-                .eq("id", following_id)
-                .single()
-                .execute()
-            )
-
-            if not target_user.data:
+            if e.code == "P0002":
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="user not found"
                 )
-
-            # 创建关注记录
-            response = (
-                self.supabase.table("user_follows")
-                .insert({"follower_id": follower_id, "following_id": following_id})
-                .execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST, detail="follow user error"
-                )
-
-            return UserFollowResponse(**response.data[0])
-
-        except HTTPException:
             raise
-        except Exception as e:
+
+        data = response.data
+        row = (data[0] if data else None) if isinstance(data, list) else data
+        if not row:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"follow user error: {str(e)}",
+                status_code=status.HTTP_400_BAD_REQUEST, detail="follow user error"
             )
 
+        return UserFollowResponse.model_validate(row)
+
     async def unfollow_user(
         self, follower_id: str, following_id: str
     ) -> Dict[str, Any]:
@@ -445,31 +688,21 @@ class UserService:
         Raises:
             HTTPException: 404 如果未关注该用户
         """
-        try:
-            response = (
-                self.supabase.table("user_follows")
-                .delete()
-                .eq("follower_id", follower_id)
-                .eq("following_id", following_id)
-                .execute()
-            )
-
-            if not response.data:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="not follow this user",
-                )
-
-            return {"success": True, "message": "unfollow user success"}
-
-        except HTTPException:
-            raise
-        except Exception as e:
+        response = await self._execute(
+            self.supabase.table("user_follows")
+            .delete()
+            .eq("follower_id", follower_id)
+            .eq("following_id", following_id)
+        )
+
+        if not response.data:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"unfollow user error: {str(e)}",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="not follow this user",
             )
 
+        return {"success": True, "message": "unfollow user success"}
+
     async def get_follow_status(
         self, current_user_id: Optional[str], target_user_id: str
     ) -> FollowStatusResponse:
@@ -483,45 +716,19 @@ class UserService:
         Returns:
             FollowStatusResponse: 关注状态
         """
-        try:
-            # 获取目标用户的 followers_count 和 following_count
-            user_response = (
-                self.supabase.table("user_profiles")
-                .select("followers_count, following_count")
-                .eq("id", target_user_id)
-                .single()
-                .execute()
+        # 计数和是否关注在数据库函数中一次查询完成
+        response = await self._execute(
+            self.supabase.rpc(
+                "get_follow_status",
+                {"target": target_user_id, "viewer": current_user_id},
             )
+        )
 
-            followers_count = 0
-            following_count = 0
-            if user_response.data:
-                followers_count = user_response.data.get("followers_count", 0) or 0
-                following_count = user_response.data.get("following_count", 0) or 0
-
-            # 检查当前用户是否关注目标用户
-            is_following = False
-            if current_user_id and current_user_id != target_user_id:
-                follow_check = (
-                    self.supabase.table("user_follows")
-                    .select("id")
-                    .eq("follower_id", current_user_id)
-                    .eq("following_id", target_user_id)
-                    .execute()
-                )
-                is_following = bool(follow_check.data)
+        # 目标用户不存在时返回空结果，保持默认值
+        if not response.data:
+            return FollowStatusResponse(is_following=False)
 
-            return FollowStatusResponse(
-                is_following=is_following,
-                followers_count=followers_count,
-                following_count=following_count,
-            )
-
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get follow status error: {str(e)}",
-            )
+        return FollowStatusResponse.model_validate(response.data[0])
 
     async def get_followers(
         self,
@@ -542,76 +749,28 @@ class UserService:
         Returns:
             FollowListResponse: 粉丝列表
         """
-        try:
-            offset = (page - 1) * page_size
-
-            # 获取粉丝列表
-            response = (
-                self.supabase.table("user_follows")
-                .select("follower_id, created_at", count="exact")
-                .eq("following_id", user_id)
-                .order("created_at", desc=True)
-                .range(offset, offset + page_size - 1)
-                .execute()
-            )
+        offset = (page - 1) * page_size
 
-            follower_ids = (
-                [f["follower_id"] for f in response.data] if response.data else []
+        # 列表、用户资料和关注状态在数据库函数中一次查询完成
+        response = await self._execute(
+            self.supabase.rpc(
+                "get_followers_page",
+                {
+                    "target": user_id,
+                    "viewer": current_user_id,
+                    "lim": page_size,
+                    "off": offset,
+                },
             )
+        )
 
-            # 获取用户信息
-            users = []
-            if follower_ids:
-                user_response = (
-                    self.supabase.table("user_profiles")
-                    .select("id, username, full_name, avatar_url")
-                    .in_("id", follower_ids)
-                    .execute()
-                )
-
-                user_map = (
-                    {u["id"]: u for u in user_response.data}
-                    if user_response.data
-                    else {}
-                )
-
-                # 检查当前用户是否关注这些粉丝
-                following_set = set()
-                if current_user_id:
-                    following_check = (
-                        self.supabase.table("user_follows")
-                        .select("following_id")
-                        .eq("follower_id", current_user_id)
-                        .in_("following_id", follower_ids)
-                        .execute()
-                    )
-                    following_set = (
-                        {f["following_id"] for f in following_check.data}
-                        if following_check.data
-                        else set()
-                    )
-
-                for fid in follower_ids:
-                    user_info = user_map.get(fid, {})
-                    users.append(
-                        FollowUserInfo(
-                            user_id=fid,
-                            username=user_info.get("username"),
-                            full_name=user_info.get("full_name"),
-                            avatar_url=user_info.get("avatar_url"),
-                            is_following=fid in following_set,
-                        )
-                    )
-
-            return FollowListResponse(
-                users=users, total=response.count or 0, page=page, page_size=page_size
-            )
+        rows = response.data or []
+        users = _FOLLOW_USER_LIST_ADAPTER.validate_python(rows)
+        total = rows[0]["total"] if rows else 0
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get followers list error: {str(e)}",
-            )
+        return FollowListResponse(
+            users=users, total=total, page=page, page_size=page_size
+        )
 
     async def get_following(
         self,
@@ -632,83 +791,60 @@ class UserService:
         Returns:
             FollowListResponse: 关注列表
         """
-        try:
-            offset = (page - 1) * page_size
-
-            # 获取关注列表
-            response = (
-                self.supabase.table("user_follows")
-                .select("following_id, created_at", count="exact")
-                .eq("follower_id", user_id)
-                .order("created_at", desc=True)
-                .range(offset, offset + page_size - 1)
-                .execute()
-            )
-
-            following_ids = (
-                [f["following_id"] for f in response.data] if response.data else []
-            )
-
-            # 获取用户信息
-            users = []
-            if following_ids:
-                user_response = (
-                    self.supabase.table("user_profiles")
-                    .select("id, username, full_name, avatar_url")
-                    .in_("id", following_ids)
-                    .execute()
-                )
+        offset = (page - 1) * page_size
+
+        # 列表、用户资料和关注状态在数据库函数中一次查询完成
+        response = await self._execute(
+            self.supabase.rpc(
+                "get_following_page",
+                {
+                    "target": user_id,
+                    "viewer": current_user_id,
+                    "lim": page_size,
+                    "off": offset,
+                },
+            )
+        )
+
+        rows = response.data or []
+        users = _FOLLOW_USER_LIST_ADAPTER.validate_python(rows)
+        total = rows[0]["total"] if rows else 0
+
+        return FollowListResponse(
+            users=users, total=total, page=page, page_size=page_size
+        )
+
+    async def get_profiles_with_follow_flags(
+        self, current_user_id: Optional[str], user_ids: List[str]
+    ) -> List[FollowUserInfo]:
+        """
+        批量获取用户基本资料及当前用户是否关注
 
-                user_map = (
-                    {u["id"]: u for u in user_response.data}
-                    if user_response.data
-                    else {}
-                )
+        Args:
+            current_user_id: 当前用户ID（可选，未登录时 is_following 均为 False）
+            user_ids: 要获取的用户ID列表
 
-                # 检查当前用户是否也关注这些用户
-                following_set = set()
-                if current_user_id and current_user_id != user_id:
-                    following_check = (
-                        self.supabase.table("user_follows")
-                        .select("following_id")
-                        .eq("follower_id", current_user_id)
-                        .in_("following_id", following_ids)
-                        .execute()
-                    )
-                    following_set = (
-                        {f["following_id"] for f in following_check.data}
-                        if following_check.data
-                        else set()
-                    )
-                elif current_user_id == user_id:
-                    # 如果查看的是自己的关注列表，所有人都是已关注状态
-                    following_set = set(following_ids)
-
-                for fid in following_ids:
-                    user_info = user_map.get(fid, {})
-                    users.append(
-                        FollowUserInfo(
-                            user_id=fid,
-                            username=user_info.get("username"),
-                            full_name=user_info.get("full_name"),
-                            avatar_url=user_info.get("avatar_url"),
-                            is_following=fid in following_set,
-                        )
-                    )
+        Returns:
+            List[FollowUserInfo]: 按 user_ids 顺序返回存在的用户
+        """
+        if not user_ids:
+            return []
 
-            return FollowListResponse(
-                users=users, total=response.count or 0, page=page, page_size=page_size
+        response = await self._execute(
+            self.supabase.rpc(
+                "profiles_with_follow",
+                {"viewer": current_user_id, "ids": user_ids},
             )
+        )
 
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get following list error: {str(e)}",
-            )
+        user_map = {row["user_id"]: row for row in response.data or []}
+        rows = [user_map[uid] for uid in user_ids if uid in user_map]
+
+        return _FOLLOW_USER_LIST_ADAPTER.validate_python(rows)
 
     async def check_batch_following(
         self, current_user_id: str, user_ids: List[str]
-    ) -> Dict[str, bool]:
+    ) -> FrozenSet[str]:
         """
         批量检查当前用户是否关注了指定用户列表
 
@@ -717,28 +853,16 @@ class UserService:
             user_ids: 要检查的用户ID列表
 
         Returns:
-            Dict[str, bool]: 用户ID到是否关注的映射
+            FrozenSet[str]: user_ids 中当前用户已关注的用户ID集合
         """
         if not user_ids:
-            return {}
+            return frozenset()
 
-        try:
-            response = (
-                self.supabase.table("user_follows")
-                .select("following_id")
-                .eq("follower_id", current_user_id)
-                .in_("following_id", user_ids)
-                .execute()
-            )
+        response = await self._execute(
+            self.supabase.table("user_follows")
+            .select("following_id")
+            .eq("follower_id", current_user_id)
+            .in_("following_id", user_ids)
+        )
 
-            following_set = (
-                {f["following_id"] for f in response.data} if response.data else set()
-            )
-
-            return {uid: uid in following_set for uid in user_ids}
-
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"get follow status error: {str(e)}",
-            )
+        return frozenset(f["following_id"] for f in response.data or ())
@@ -29,7 +29,10 @@ from .database import (
     compute_post_hash,
     post_exists,
     note_id_exists,
+    note_ids_exist,
+    post_hashes_exist,
     insert_post,
+    insert_posts_bulk,
     get_stats,
     get_recent_posts,
 )
@@ -38,16 +41,24 @@ from .extractors import (
     parse_count,
     parse_xhs_date,
     extract_note_id_from_url,
-    extract_note_card,
+    extract_all_note_cards,
+    extract_note_cards_batch,
     extract_note_detail,
     merge_note_data,
 )
 
-from .scraper import XiaohongshuScraper
-
 from .cli import main
 
 
+def __getattr__(name):
+    # XiaohongshuScraper 会加载 Playwright，首次访问时再导入
+    if name == "XiaohongshuScraper":
+        from .scraper import XiaohongshuScraper
+
+        return XiaohongshuScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Config
     "COOKIES_FILE",
@@ -63,14 +74,18 @@ __all__ = [
     "compute_post_hash",
     "post_exists",
     "note_id_exists",
+    "note_ids_exist",
+    "post_hashes_exist",
     "insert_post",
+    "insert_posts_bulk",
     "get_stats",
     "get_recent_posts",
     # Extractors
     "parse_count",
     "parse_xhs_date",
     "extract_note_id_from_url",
-    "extract_note_card",
+    "extract_all_note_cards",
+    "extract_note_cards_batch",
     "extract_note_detail",
     "merge_note_data",
     # Core
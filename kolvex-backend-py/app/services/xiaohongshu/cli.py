@@ -2,15 +2,15 @@
 CLI 命令行入口
 """
 
-import argparse
-
-from .scraper import XiaohongshuScraper
 from .database import get_supabase_client, get_stats, get_recent_posts
 from .config import DEFAULT_KEYWORDS
 
 
 def main():
     """命令行入口"""
+    # argparse 仅在 CLI 运行时需要，避免随包导入时加载
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="小红书美股热帖爬虫",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -92,6 +92,20 @@ def main():
         help="不获取详情页（更快但数据较少）",
     )
 
+    parser.add_argument(
+        "--detail-workers",
+        type=int,
+        default=1,
+        help="并行抓取详情页的浏览器数量 (默认: 1，即顺序抓取)",
+    )
+
+    parser.add_argument(
+        "--keyword-workers",
+        type=int,
+        default=1,
+        help="并行爬取关键词的浏览器数量 (默认: 1，即顺序爬取)",
+    )
+
     parser.add_argument(
         "--cookies",
         type=str,
@@ -137,35 +151,44 @@ def main():
             limit=args.recent,
             stock_related_only=args.stock_only,
         )
-        print(f"\n📋 最近 {len(posts)} 条帖子:")
-        print("=" * 60)
+        # 先拼接所有行再一次性输出，避免逐行 print
+        lines = [f"\n📋 最近 {len(posts)} 条帖子:", "=" * 60]
+        write = lines.append
 
         for i, post in enumerate(posts, 1):
-            title = post.get("title", "无标题")[:50]
+            title = post.get("title") or "无标题"
+            if len(title) > 50:
+                title = title[:50]
             author = post.get("author_name", "未知")
             likes = post.get("like_count", 0)
             keyword = post.get("search_keyword", "")
             sentiment = post.get("ai_sentiment", "")
             tickers = post.get("ai_tickers", [])
 
-            print(f"\n{i}. {title}")
-            print(f"   👤 {author} | ❤️ {likes} | 🔍 {keyword}")
+            write(f"\n{i}. {title}")
+            write(f"   👤 {author} | ❤️ {likes} | 🔍 {keyword}")
 
             if sentiment or tickers:
                 ticker_str = ", ".join(tickers) if tickers else "无"
-                print(f"   🤖 情绪: {sentiment or '未分析'} | 股票: {ticker_str}")
+                write(f"   🤖 情绪: {sentiment or '未分析'} | 股票: {ticker_str}")
 
             if post.get("permalink"):
-                print(f"   🔗 {post['permalink']}")
+                write(f"   🔗 {post['permalink']}")
 
+        print("\n".join(lines))
         return
 
+    # 仅在登录 / 爬取模式下导入爬虫（会加载 Playwright）
+    from .scraper import XiaohongshuScraper
+
     # 创建爬虫实例
     scraper = XiaohongshuScraper(
         cookies_file=args.cookies,
         headless=not args.no_headless,
         max_posts=args.max_posts,
         fetch_details=not args.no_details,
+        detail_workers=args.detail_workers,
+        keyword_workers=args.keyword_workers,
     )
 
     try:
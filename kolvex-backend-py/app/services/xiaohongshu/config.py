@@ -3,21 +3,22 @@
 """
 
 from pathlib import Path
+from types import MappingProxyType
 
 # Cookies 文件路径
 COOKIES_FILE = Path(__file__).parent.parent.parent / "xhs_cookies.json"
 
 # 真实的 User-Agent 列表
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-]
+)
 
 # 小红书搜索关键词预设
-DEFAULT_KEYWORDS = [
+DEFAULT_KEYWORDS = (
     "美股",
     "美股投资",
     "美股分析",
@@ -27,18 +28,27 @@ DEFAULT_KEYWORDS = [
     "苹果股票",
     "纳斯达克",
     "标普500",
-]
+)
 
 # 基础 URL
 BASE_URL = "https://www.xiaohongshu.com"
 SEARCH_URL = "https://www.xiaohongshu.com/search_result"
 
+# 笔记列表 JSON 接口（搜索页 / 发现页由这些接口驱动，拦截响应比解析 DOM 更快更稳定）
+NOTE_FEED_API_PATHS = (
+    "/api/sns/web/v1/search/notes",
+    "/api/sns/web/v1/homefeed",
+)
+
 # 默认爬虫配置
 DEFAULT_MAX_POSTS = 20  # 每次搜索最多爬取的帖子数量
 DEFAULT_DELAY_BETWEEN_POSTS = (2.0, 5.0)  # 帖子间延迟范围 (min, max) 秒
 DEFAULT_DELAY_DURING_SCROLL = (1.5, 3.5)  # 滚动时延迟范围 (min, max) 秒
 DEFAULT_MAX_SCROLLS = 15  # 最大滚动次数
 DEFAULT_POST_MAX_AGE_DAYS = 30  # 最大帖子年龄（天）
+DEFAULT_DETAIL_WORKERS = 1  # 并行抓取详情页的浏览器数量（1 = 在搜索页内顺序抓取）
+DEFAULT_KEYWORD_WORKERS = 1  # 并行爬取关键词的浏览器数量（1 = 顺序爬取）
+MAX_CONCURRENT_BROWSERS = 4  # 关键词会话 + 详情 worker 同时打开的浏览器总数上限
 
 # 超时配置 (毫秒)
 PAGE_LOAD_TIMEOUT = 30000
@@ -47,18 +57,23 @@ NETWORK_IDLE_TIMEOUT = 8000
 SETUP_LOGIN_TIMEOUT = 300  # 秒
 
 # 浏览器配置
-BROWSER_ARGS = [
+BROWSER_ARGS = (
     "--disable-blink-features=AutomationControlled",
     "--disable-dev-shm-usage",
     "--no-sandbox",
-]
+)
+
+# 无头爬取时拦截的资源类型（只读取文本和属性，不需要下载图片、视频、字体）
+# 样式表保留：滚动加载和可见性检测依赖页面布局
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
 
 BROWSER_VIEWPORT = {"width": 1440, "height": 900}
 BROWSER_LOCALE = "zh-CN"
 BROWSER_TIMEZONE = "Asia/Shanghai"
 
 # 小红书 CSS 选择器（可能需要根据实际页面结构调整）
-SELECTORS = {
+# 使用只读映射，避免运行时被意外修改
+SELECTORS = MappingProxyType({
     # 搜索结果页面
     "note_card": 'section.note-item, [data-v-a264b01a].note-item, .note-item',
     "note_link": 'a.cover, a[href*="/explore/"], a[href*="/search_result/"]',
@@ -85,7 +100,7 @@ SELECTORS = {
     "logged_in_indicator": '.user-avatar, .user-info, [class*="user-menu"]',
     
     # 登录弹窗关闭按钮
-    "login_popup_close": [
+    "login_popup_close": (
         # 小红书登录弹窗关闭按钮选择器
         '[class*="login"] [class*="close"]',
         '[class*="modal"] [class*="close"]',
@@ -94,6 +109,26 @@ SELECTORS = {
         '[class*="icon-close"]',
         'button[aria-label="关闭"]',
         '.close-button',
-    ],
-}
+    ),
+})
+
+# 搜索结果加载检测选择器（按优先级尝试）
+SEARCH_RESULT_SELECTORS = (
+    "section.note-item",
+    ".note-item",
+    '[class*="note-item"]',
+    ".feeds-page section",
+    'a[href*="/explore/"]',
+)
+
+# 登录弹窗检测选择器（模块级常量，检测时不再每次构建列表）
+LOGIN_POPUP_SELECTORS = (
+    '[class*="login-modal"]',
+    '[class*="login-container"]',
+    '[class*="login-dialog"]',
+    '[class*="login-popup"]',
+)
+
+# 合并为一个只匹配可见元素的选择器（Playwright 的 :visible 伪类），一次查询完成检测
+VISIBLE_LOGIN_POPUP_SELECTOR = ", ".join(f"{s}:visible" for s in LOGIN_POPUP_SELECTORS)
 
@@ -3,30 +3,77 @@
 """
 
 import os
-import json
+import re
 import hashlib
-from typing import Dict, Optional, Tuple, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple, List
 from datetime import datetime, timedelta, timezone
 
 # Supabase 相关导入
 try:
     from supabase import create_client, Client
+    from supabase.lib.client_options import ClientOptions
 
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
     Client = None
 
+from app.utils.cache import TTLCache
+
 from .config import DEFAULT_POST_MAX_AGE_DAYS
 
+# 小红书时间默认时区（UTC+8）
+CST = timezone(timedelta(hours=8))
+
+# 唯一约束冲突的错误信息特征（并发插入同一帖子时出现）
+_DUPLICATE_ERROR_RE = re.compile(r"duplicate|unique", re.IGNORECASE)
+
+# 已确认入库的 note_id（进程内），命中时跳过数据库查询
+# 同一轮爬取中不同关键词、不同滚动批次经常重复遇到相同笔记
+_known_note_ids = TTLCache(maxsize=100_000, ttl=3600)
+
+# get_recent_posts 默认返回的列（列表展示用）
+RECENT_POST_FIELDS = (
+    "id",
+    "note_id",
+    "title",
+    "author_name",
+    "like_count",
+    "search_keyword",
+    "permalink",
+    "scraped_at",
+    "ai_sentiment",
+    "ai_tickers",
+)
+
+# PostgREST 请求超时（秒），默认 120 秒，网络异常时会让单条插入卡住很久
+POSTGREST_TIMEOUT = 10
+
+# 批量检查 note_id 时每次请求的最大数量
+NOTE_ID_CHUNK_SIZE = 500
+
+# 统计信息缓存（/stats 接口会被频繁轮询），插入新帖子后失效
+STATS_CACHE_TTL = 60
+_stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+
+# 进程内复用的 Supabase 客户端（避免每次调用都重新读取 .env 并创建 HTTP 会话）
+_client: Optional[Client] = None
+
 
 def get_supabase_client() -> Optional[Client]:
     """
-    获取 Supabase 客户端
+    获取 Supabase 客户端（首次创建后复用）
 
     Returns:
         Optional[Client]: Supabase 客户端，如果未配置返回 None
     """
+    global _client
+    if _client is not None:
+        return _client
+
     if not SUPABASE_AVAILABLE:
         print("⚠️ Supabase 未安装，请运行: pip install supabase")
         return None
@@ -45,7 +92,12 @@ def get_supabase_client() -> Optional[Client]:
         )
         return None
 
-    return create_client(supabase_url, supabase_key)
+    _client = create_client(
+        supabase_url,
+        supabase_key,
+        options=ClientOptions(postgrest_client_timeout=POSTGREST_TIMEOUT),
+    )
+    return _client
 
 
 def compute_post_hash(note_id: str, content: str) -> str:
@@ -99,6 +151,9 @@ def note_id_exists(client: Client, note_id: str) -> bool:
     Returns:
         bool: 如果存在返回 True
     """
+    if _known_note_ids.get(note_id):
+        return True
+
     try:
         result = (
             client.table("xhs_posts")
@@ -107,21 +162,95 @@ def note_id_exists(client: Client, note_id: str) -> bool:
             .limit(1)
             .execute()
         )
-        return len(result.data) > 0
+        if result.data:
+            _known_note_ids.set(note_id, True)
+            return True
+        return False
     except Exception as e:
         print(f"⚠️ 检查笔记 ID 是否存在失败: {e}")
         return False
 
 
+def note_ids_exist(client: Client, note_ids: Iterable[str]) -> Set[str]:
+    """
+    批量检查笔记 ID 是否已存在（一次查询）
+
+    Args:
+        client: Supabase 客户端
+        note_ids: 小红书笔记 ID 列表
+
+    Returns:
+        Set[str]: 数据库中已存在的笔记 ID
+    """
+    existing = set()
+    missing = []
+    for note_id in note_ids:
+        if _known_note_ids.get(note_id):
+            existing.add(note_id)
+        else:
+            missing.append(note_id)
+
+    try:
+        # 分块查询，避免 in.(...) 过滤条件让 URL 超长
+        for start in range(0, len(missing), NOTE_ID_CHUNK_SIZE):
+            result = (
+                client.table("xhs_posts")
+                .select("note_id")
+                .in_("note_id", missing[start : start + NOTE_ID_CHUNK_SIZE])
+                .execute()
+            )
+            for row in result.data:
+                existing.add(row["note_id"])
+                _known_note_ids.set(row["note_id"], True)
+    except Exception as e:
+        print(f"⚠️ 批量检查笔记 ID 是否存在失败: {e}")
+
+    return existing
+
+
+def post_hashes_exist(client: Client, post_hashes: Iterable[str]) -> Set[str]:
+    """
+    批量检查帖子哈希是否已存在（post_hash 唯一约束，同内容不同 note_id 时会冲突）
+
+    Args:
+        client: Supabase 客户端
+        post_hashes: 帖子哈希列表
+
+    Returns:
+        Set[str]: 数据库中已存在的帖子哈希
+    """
+    post_hashes = list(post_hashes)
+    existing = set()
+
+    try:
+        for start in range(0, len(post_hashes), NOTE_ID_CHUNK_SIZE):
+            result = (
+                client.table("xhs_posts")
+                .select("post_hash")
+                .in_("post_hash", post_hashes[start : start + NOTE_ID_CHUNK_SIZE])
+                .execute()
+            )
+            existing.update(row["post_hash"] for row in result.data)
+    except Exception as e:
+        print(f"⚠️ 批量检查帖子哈希是否存在失败: {e}")
+
+    return existing
+
+
 def insert_post(
     client: Client,
     post_data: Dict,
     max_age_days: int = DEFAULT_POST_MAX_AGE_DAYS,
     enable_ai_analysis: bool = True,
+    check_exists: bool = True,
+    return_id: bool = True,
 ) -> Tuple[bool, Optional[int]]:
     """
     插入帖子到 Supabase 数据库（如果不存在且不太旧），并进行 AI 分析
 
+    去重依赖 note_id / post_hash 唯一约束（INSERT ... ON CONFLICT DO NOTHING），
+    只在需要 AI 分析时预先检查 note_id，避免为已入库的帖子调用 AI
+
     Args:
         client: Supabase 客户端
         post_data: 帖子数据字典，包含:
@@ -144,169 +273,371 @@ def insert_post(
             - created_at: 创建时间
         max_age_days: 最大帖子年龄（天），超过此天数的帖子不会被插入
         enable_ai_analysis: 是否启用 AI 分析（默认 True）
+        check_exists: AI 分析前是否检查 note_id 已存在（调用方已批量检查时传 False）
+        return_id: 是否返回帖子 ID；为 False 时使用 return=minimal，不回传插入的行
 
     Returns:
         Tuple[bool, Optional[int]]: (插入成功返回 True，帖子 ID 或 None)
     """
     note_id = post_data.get("note_id")
-    
-    # 检查笔记 ID 是否已存在（快速去重）
-    if note_id and note_id_exists(client, note_id):
-        return False, None
-    
-    # 检查帖子时间，如果太旧就跳过
-    created_at_str = post_data.get("created_at")
-    if created_at_str:
-        try:
-            # 解析时间
-            if isinstance(created_at_str, str):
-                if created_at_str.endswith("Z"):
-                    created_at_str = created_at_str[:-1] + "+00:00"
-                post_time = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-            else:
-                post_time = created_at_str
 
-            # 如果是 naive datetime，假设为 UTC+8
-            if post_time.tzinfo is None:
-                post_time = post_time.replace(tzinfo=timezone(timedelta(hours=8)))
-
-            cutoff_time = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    # 检查笔记 ID 是否已存在（避免对重复帖子做 AI 分析）
+    if check_exists and enable_ai_analysis and note_id and note_id_exists(client, note_id):
+        return False, None
 
-            if post_time < cutoff_time:
-                print(
-                    f"   ⏭️ 跳过旧帖子 ({str(created_at_str)[:10]}): {post_data.get('title', '')[:30]}..."
-                )
-                return False, None
-        except Exception:
-            # 解析失败就继续插入
-            pass
+    # 检查帖子时间，如果太旧就跳过
+    now = datetime.now(timezone.utc)
+    if _is_too_old(post_data, now - timedelta(days=max_age_days)):
+        return False, None
 
     content = post_data.get("content", "") or post_data.get("title", "")
     post_hash = compute_post_hash(note_id or "", content)
 
-    if post_exists(client, post_hash):
-        return False, None
-
     # 进行 AI 分析（在插入前）
     ai_analysis = None
     if enable_ai_analysis:
         ai_analysis = _perform_ai_analysis(content, post_data.get("title", ""))
 
     try:
-        # 处理列表字段 - 转换为 JSON
-        image_urls = post_data.get("image_urls", [])
-        image_urls_json = json.dumps(image_urls) if image_urls else None
-        
-        tags = post_data.get("tags", [])
-        tags_json = json.dumps(tags) if tags else None
-
-        # 辅助函数：安全截断字符串
-        def safe_str(value, max_len: int) -> Optional[str]:
-            if value is None:
-                return None
-            return str(value)[:max_len] if value else None
-
-        data = {
-            # 基础信息（按数据库字段长度截断）
-            "note_id": safe_str(note_id, 64),
-            "post_hash": post_hash,
-            "title": post_data.get("title"),
-            "content": content,
-            "author_name": safe_str(post_data.get("author_name"), 255),
-            "author_id": safe_str(post_data.get("author_id"), 64),
-            "author_avatar": post_data.get("author_avatar"),
-            "cover_url": post_data.get("cover_url"),
-            "image_urls": image_urls_json,
-            "video_url": post_data.get("video_url"),
-            "note_type": safe_str(post_data.get("note_type", "normal"), 20),
-            "permalink": post_data.get("permalink"),
-            # 互动数据
-            "like_count": post_data.get("like_count", 0),
-            "collect_count": post_data.get("collect_count", 0),
-            "comment_count": post_data.get("comment_count", 0),
-            "share_count": post_data.get("share_count", 0),
-            # 标签
-            "tags": tags_json,
-            # 搜索关键词
-            "search_keyword": safe_str(post_data.get("search_keyword"), 100),
-            # 时间
-            "created_at": post_data.get("created_at"),
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-        # 添加 AI 分析结果
-        if ai_analysis:
-            stock_related_data = ai_analysis.get("is_stock_related", {})
-            trading_signal = ai_analysis.get("trading_signal")
-            # 处理 trading_signal 可能是 dict 的情况
-            if isinstance(trading_signal, dict):
-                trading_signal = trading_signal.get("action")
-            
-            data.update(
-                {
-                    # 情感分析（VARCHAR(20)）
-                    "ai_sentiment": safe_str(
-                        ai_analysis.get("sentiment", {}).get("sentiment"), 20
-                    ),
-                    "ai_sentiment_confidence": ai_analysis.get("sentiment", {}).get(
-                        "confidence"
-                    ),
-                    "ai_sentiment_reasoning": ai_analysis.get("sentiment", {}).get(
-                        "reasoning"
-                    ),
-                    # 股票代码和标签 (JSONB)
-                    "ai_tickers": ai_analysis.get("tickers", []),
-                    "ai_tags": ai_analysis.get("tags", []),
-                    # 摘要和投资信号（VARCHAR(20)）
-                    "ai_summary": ai_analysis.get("summary"),
-                    "ai_trading_signal": safe_str(trading_signal, 20),
-                    # 股市相关性
-                    "ai_is_stock_related": stock_related_data.get(
-                        "is_stock_related", False
-                    ),
-                    "ai_stock_related_confidence": stock_related_data.get("confidence"),
-                    "ai_stock_related_reason": stock_related_data.get("reason"),
-                    # 元数据（VARCHAR(50)）
-                    "ai_analyzed_at": ai_analysis.get("analyzed_at"),
-                    "ai_model": safe_str(ai_analysis.get("model"), 50),
-                }
+        data = _build_post_row(
+            post_data, post_hash, content, ai_analysis, now.isoformat()
+        )
+        if return_id:
+            query = client.table("xhs_posts").upsert(
+                data, on_conflict="note_id", ignore_duplicates=True
             )
-
-        result = client.table("xhs_posts").insert(data).execute()
-        # 获取插入的帖子 ID
-        post_id = result.data[0]["id"] if result.data else None
-        return True, post_id
+        else:
+            # 不需要 ID 时只取受影响行数，响应体为空
+            query = client.table("xhs_posts").upsert(
+                data,
+                on_conflict="note_id",
+                ignore_duplicates=True,
+                returning="minimal",
+                count="exact",
+            )
+        result = query.execute()
+        if note_id:
+            _known_note_ids.set(note_id, True)
+        # 冲突时没有受影响的行，说明帖子已存在
+        if not (result.data if return_id else result.count):
+            return False, None
+        _stats_cache.clear()
+        return True, result.data[0]["id"] if return_id else None
     except Exception as e:
-        # 可能是唯一约束冲突（并发情况）
-        if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+        # post_hash 唯一约束冲突（同内容不同 note_id，或并发插入）
+        if _DUPLICATE_ERROR_RE.search(str(e)):
             return False, None
         print(f"⚠️ 插入帖子失败: {e}")
         return False, None
 
 
+def insert_posts_bulk(
+    client: Client,
+    posts: List[Dict],
+    max_age_days: int = DEFAULT_POST_MAX_AGE_DAYS,
+    enable_ai_analysis: bool = True,
+    check_exists: bool = True,
+) -> int:
+    """
+    批量插入帖子（批量查询去重 + 一次 upsert 写入）
+
+    整批写入失败时（如其他约束冲突）逐条重试已构建好的行，
+    已完成的 AI 分析不会因为一行出错而整批丢失
+
+    Args:
+        client: Supabase 客户端
+        posts: 帖子数据列表，字段同 insert_post
+        max_age_days: 最大帖子年龄（天）
+        enable_ai_analysis: 是否启用 AI 分析（默认 True）
+        check_exists: 是否检查 note_id 已存在（调用方已批量检查时传 False）
+
+    Returns:
+        int: 新插入的帖子数量
+    """
+    # 整批共用同一个截止时间和爬取时间
+    now = datetime.now(timezone.utc)
+    cutoff_time = now - timedelta(days=max_age_days)
+    scraped_at = now.isoformat()
+
+    # 先在本地过滤掉太旧的帖子，只对剩下的帖子查询数据库
+    fresh = [post for post in posts if not _is_too_old(post, cutoff_time)]
+    if not fresh:
+        return 0
+
+    existing = set()
+    if check_exists:
+        existing = note_ids_exist(
+            client, {post["note_id"] for post in fresh if post.get("note_id")}
+        )
+
+    candidates = []
+    seen_hashes = set()
+    for post_data in fresh:
+        note_id = post_data.get("note_id")
+        if note_id in existing:
+            continue
+
+        content = post_data.get("content", "") or post_data.get("title", "")
+        post_hash = compute_post_hash(note_id or "", content)
+        if post_hash in seen_hashes:
+            continue
+        seen_hashes.add(post_hash)
+        if note_id:
+            existing.add(note_id)
+
+        candidates.append((post_data, post_hash, content))
+
+    if not candidates:
+        return 0
+
+    # 内容哈希已存在的帖子会触发 post_hash 唯一约束，在 AI 分析前剔除
+    existing_hashes = post_hashes_exist(client, seen_hashes)
+    if existing_hashes:
+        candidates = [c for c in candidates if c[1] not in existing_hashes]
+        if not candidates:
+            return 0
+
+    # AI 分析是独立的 HTTP 调用，用线程池并发执行
+    analyses = [None] * len(candidates)
+    if enable_ai_analysis:
+        with ThreadPoolExecutor(
+            max_workers=min(AI_MAX_WORKERS, len(candidates))
+        ) as executor:
+            analyses = list(
+                executor.map(
+                    lambda c: _perform_ai_analysis(c[2], c[0].get("title", "")),
+                    candidates,
+                )
+            )
+
+    rows = [
+        _build_post_row(post_data, post_hash, content, ai_analysis, scraped_at)
+        for (post_data, post_hash, content), ai_analysis in zip(candidates, analyses)
+    ]
+
+    failed_note_ids = set()
+    try:
+        inserted = _upsert_rows(client, rows)
+    except Exception as e:
+        # 并发写入等原因导致整批失败时逐条写入，单行冲突只跳过该行
+        print(f"⚠️ 批量插入帖子失败，改为逐条插入: {e}")
+        inserted = 0
+        for row in rows:
+            try:
+                inserted += _upsert_rows(client, [row])
+            except Exception as row_error:
+                if not _DUPLICATE_ERROR_RE.search(str(row_error)):
+                    print(f"⚠️ 插入帖子失败: {row_error}")
+                    failed_note_ids.add(row["note_id"])
+
+    # 写入成功或已存在的笔记记入缓存，写入失败的下次仍会重试
+    for post_data, _, _ in candidates:
+        note_id = post_data.get("note_id")
+        if note_id and note_id not in failed_note_ids:
+            _known_note_ids.set(note_id, True)
+
+    if inserted:
+        _stats_cache.clear()
+    return inserted
+
+
+def _upsert_rows(client: Client, rows: List[Dict]) -> int:
+    """
+    写入帖子行（note_id 冲突时忽略），只返回受影响行数
+
+    Args:
+        client: Supabase 客户端
+        rows: _build_post_row 构建的行数据
+
+    Returns:
+        int: 新插入的行数
+    """
+    result = (
+        client.table("xhs_posts")
+        .upsert(
+            rows,
+            on_conflict="note_id",
+            ignore_duplicates=True,
+            returning="minimal",
+            count="exact",
+        )
+        .execute()
+    )
+    return result.count or 0
+
+
+def _is_too_old(post_data: Dict, cutoff_time: datetime) -> bool:
+    """
+    判断帖子是否超过最大年龄（解析失败时视为不旧，继续插入）
+
+    Args:
+        post_data: 帖子数据
+        cutoff_time: 截止时间，早于该时间的帖子视为太旧
+
+    Returns:
+        bool: 太旧返回 True
+    """
+    created_at_str = post_data.get("created_at")
+    if not created_at_str:
+        return False
+
+    try:
+        # 解析时间（Python 3.11+ 的 fromisoformat 直接支持 Z 后缀）
+        if isinstance(created_at_str, str):
+            post_time = datetime.fromisoformat(created_at_str)
+        else:
+            post_time = created_at_str
+
+        # 如果是 naive datetime，假设为 UTC+8
+        if post_time.tzinfo is None:
+            post_time = post_time.replace(tzinfo=CST)
+    except Exception:
+        return False
+
+    if post_time < cutoff_time:
+        print(
+            f"   ⏭️ 跳过旧帖子 ({str(created_at_str)[:10]}): {post_data.get('title', '')[:30]}..."
+        )
+        return True
+    return False
+
+
+def _safe_str(value, max_len: int) -> Optional[str]:
+    """安全截断字符串（按数据库字段长度），空值返回 None"""
+    return str(value)[:max_len] if value else None
+
+
+def _build_post_row(
+    post_data: Dict,
+    post_hash: str,
+    content: str,
+    ai_analysis: Optional[Dict],
+    scraped_at: str,
+) -> Dict:
+    """
+    构建 xhs_posts 行数据
+
+    未做 AI 分析时 AI 字段取与表默认值一致的空值，保证批量 upsert 时每行的列相同
+
+    Args:
+        post_data: 帖子数据
+        post_hash: 帖子哈希
+        content: 帖子内容（为空时已回退为标题）
+        ai_analysis: AI 分析结果
+        scraped_at: 爬取时间（ISO 格式）
+
+    Returns:
+        Dict: 行数据
+    """
+    data = {
+        # 基础信息（按数据库字段长度截断）
+        "note_id": _safe_str(post_data.get("note_id"), 64),
+        "post_hash": post_hash,
+        "title": post_data.get("title"),
+        "content": content,
+        "author_name": _safe_str(post_data.get("author_name"), 255),
+        "author_id": _safe_str(post_data.get("author_id"), 64),
+        "author_avatar": post_data.get("author_avatar"),
+        "cover_url": post_data.get("cover_url"),
+        # JSONB 列直接传列表，由客户端序列化一次（不再预先 json.dumps 成字符串）
+        "image_urls": post_data.get("image_urls") or None,
+        "video_url": post_data.get("video_url"),
+        "note_type": _safe_str(post_data.get("note_type", "normal"), 20),
+        "permalink": post_data.get("permalink"),
+        # 互动数据
+        "like_count": post_data.get("like_count", 0),
+        "collect_count": post_data.get("collect_count", 0),
+        "comment_count": post_data.get("comment_count", 0),
+        "share_count": post_data.get("share_count", 0),
+        # 标签
+        "tags": post_data.get("tags") or None,
+        # 搜索关键词
+        "search_keyword": _safe_str(post_data.get("search_keyword"), 100),
+        # 时间
+        "created_at": post_data.get("created_at"),
+        "scraped_at": scraped_at,
+    }
+
+    # 添加 AI 分析结果
+    analysis = ai_analysis or {}
+    sentiment = analysis.get("sentiment") or {}
+    stock_related_data = analysis.get("is_stock_related") or {}
+    trading_signal = analysis.get("trading_signal")
+    # 处理 trading_signal 可能是 dict 的情况
+    if isinstance(trading_signal, dict):
+        trading_signal = trading_signal.get("action")
+
+    data.update(
+        {
+            # 情感分析（VARCHAR(20)）
+            "ai_sentiment": _safe_str(sentiment.get("sentiment"), 20),
+            "ai_sentiment_confidence": sentiment.get("confidence"),
+            "ai_sentiment_reasoning": sentiment.get("reasoning"),
+            # 股票代码和标签 (JSONB)
+            "ai_tickers": analysis.get("tickers", []) if ai_analysis else None,
+            "ai_tags": analysis.get("tags", []) if ai_analysis else None,
+            # 摘要和投资信号（VARCHAR(20)）
+            "ai_summary": analysis.get("summary"),
+            "ai_trading_signal": _safe_str(trading_signal, 20),
+            # 股市相关性
+            "ai_is_stock_related": stock_related_data.get(
+                "is_stock_related", False
+            ),
+            "ai_stock_related_confidence": stock_related_data.get("confidence"),
+            "ai_stock_related_reason": stock_related_data.get("reason"),
+            # 元数据（VARCHAR(50)）
+            "ai_analyzed_at": analysis.get("analyzed_at"),
+            "ai_model": _safe_str(analysis.get("model"), 50),
+        }
+    )
+    return data
+
+
 # AI 分析器单例（避免重复创建）
 _ai_analyzer = None
+# AI 服务不可用时，在该时间点（time.monotonic）之前不再重试
+_ai_retry_at = 0.0
+_ai_lock = threading.Lock()
+
+# 健康检查超时（秒），避免 Ollama 不可达时首次插入长时间阻塞
+AI_HEALTH_CHECK_TIMEOUT = 2.0
+# AI 服务不可用后的重试间隔（秒）
+AI_RETRY_INTERVAL = 30
+# 批量插入时并发执行 AI 分析的最大线程数
+AI_MAX_WORKERS = 8
 
 
 def _get_ai_analyzer():
-    """获取 AI 分析器单例"""
-    global _ai_analyzer
-    if _ai_analyzer is None:
+    """获取 AI 分析器单例（不可用时每 AI_RETRY_INTERVAL 秒重试一次）"""
+    global _ai_analyzer, _ai_retry_at
+    if _ai_analyzer is not None:
+        return _ai_analyzer
+
+    with _ai_lock:
+        if _ai_analyzer is not None or time.monotonic() < _ai_retry_at:
+            return _ai_analyzer
+
         try:
             from app.services.ai import TweetAnalyzerSync, OllamaClientSync
 
             client = OllamaClientSync()
             # 先检查 AI 服务是否可用
-            if client.health_check():
+            if client.health_check(timeout=AI_HEALTH_CHECK_TIMEOUT):
                 _ai_analyzer = TweetAnalyzerSync(client)
                 print("🤖 AI 分析器已初始化")
             else:
                 print("⚠️ AI 服务不可用，跳过 AI 分析")
-                _ai_analyzer = False  # 标记为不可用
+                _ai_retry_at = time.monotonic() + AI_RETRY_INTERVAL
         except Exception as e:
             print(f"⚠️ AI 分析器初始化失败: {e}")
-            _ai_analyzer = False
-    return _ai_analyzer if _ai_analyzer else None
+            _ai_retry_at = time.monotonic() + AI_RETRY_INTERVAL
+
+    return _ai_analyzer
+
+
+def warm_ai_analyzer() -> None:
+    """在后台线程中预先初始化 AI 分析器（健康检查不占用首次插入的时间）"""
+    threading.Thread(target=_get_ai_analyzer, daemon=True).start()
 
 
 def _perform_ai_analysis(content: str, title: str = "") -> Optional[Dict]:
@@ -339,23 +670,28 @@ def _perform_ai_analysis(content: str, title: str = "") -> Optional[Dict]:
 
 def get_stats(client: Client) -> Dict:
     """
-    获取数据库统计信息
+    获取数据库统计信息（结果缓存 STATS_CACHE_TTL 秒，插入新帖子后失效）
 
     Returns:
         Dict: 包含总数、各关键词数量等统计信息
     """
+    cached = _stats_cache.get("stats")
+    if cached is not None:
+        # 返回浅拷贝，调用方可能会往结果里追加字段
+        return dict(cached)
+
     try:
-        # 总帖子数
-        total_result = client.table("xhs_posts").select("id", count="exact").execute()
+        # 总帖子数（只需要 count，limit(1) 避免把整列 id 传回来）
+        total_result = (
+            client.table("xhs_posts").select("id", count="exact").limit(1).execute()
+        )
         total = total_result.count or 0
 
-        # 按搜索关键词统计
+        # 按搜索关键词统计（数据库端 GROUP BY，已按数量倒序）
         by_keyword = {}
         try:
-            result = client.table("xhs_posts").select("search_keyword").execute()
-            for row in result.data:
-                keyword = row.get("search_keyword") or "未知"
-                by_keyword[keyword] = by_keyword.get(keyword, 0) + 1
+            result = client.rpc("xhs_keyword_counts").execute()
+            by_keyword = {row["keyword"]: row["count"] for row in result.data}
         except Exception:
             pass
 
@@ -366,19 +702,20 @@ def get_stats(client: Client) -> Dict:
                 client.table("xhs_posts")
                 .select("id", count="exact")
                 .eq("ai_is_stock_related", True)
+                .limit(1)
                 .execute()
             )
             stock_related_count = result.count or 0
         except Exception:
             pass
 
-        return {
+        stats = {
             "total": total,
-            "by_keyword": dict(
-                sorted(by_keyword.items(), key=lambda x: x[1], reverse=True)
-            ),
+            "by_keyword": by_keyword,
             "stock_related": stock_related_count,
         }
+        _stats_cache.set("stats", stats)
+        return dict(stats)
     except Exception as e:
         print(f"⚠️ 获取统计信息失败: {e}")
         return {"total": 0, "by_keyword": {}, "stock_related": 0}
@@ -389,6 +726,8 @@ def get_recent_posts(
     limit: int = 50,
     keyword: str = None,
     stock_related_only: bool = False,
+    offset: int = 0,
+    fields: Optional[Sequence[str]] = None,
 ) -> List[Dict]:
     """
     获取最近的帖子
@@ -398,12 +737,18 @@ def get_recent_posts(
         limit: 返回数量限制
         keyword: 筛选关键词
         stock_related_only: 是否只返回股票相关帖子
+        offset: 偏移量（配合 limit 翻页）
+        fields: 返回的列，默认为列表展示所需的列（不含正文和图片等大字段）
 
     Returns:
         List[Dict]: 帖子列表
     """
     try:
-        query = client.table("xhs_posts").select("*").order("scraped_at", desc=True)
+        query = (
+            client.table("xhs_posts")
+            .select(",".join(fields or RECENT_POST_FIELDS))
+            .order("scraped_at", desc=True)
+        )
 
         if keyword:
             query = query.eq("search_keyword", keyword)
@@ -411,7 +756,7 @@ def get_recent_posts(
         if stock_related_only:
             query = query.eq("ai_is_stock_related", True)
 
-        result = query.limit(limit).execute()
+        result = query.range(offset, offset + limit - 1).execute()
         return result.data or []
     except Exception as e:
         print(f"⚠️ 获取帖子失败: {e}")
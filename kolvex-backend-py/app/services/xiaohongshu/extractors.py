@@ -3,21 +3,254 @@
 """
 
 import re
-from typing import Dict, List, Optional
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 from datetime import datetime, timezone, timedelta
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin
 
-# Playwright 类型导入
-try:
+# Playwright 仅用于类型注解，运行时不导入（--stats / --recent 等命令无需加载 Playwright）
+if TYPE_CHECKING:
     from playwright.sync_api import Page, ElementHandle
 
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    Page = None
-    ElementHandle = None
+from .config import BASE_URL
+
+# 预编译的正则表达式（解析函数在每张卡片上都会调用）
+_RE_EN_COUNT = re.compile(r"([\d.]+)\s*([KMB])?", re.IGNORECASE)
+_COUNT_STRIP_TABLE = str.maketrans("", "", ",+")
+_EN_COUNT_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+_RE_BG_URL = re.compile(r'url\(["\']?([^"\']+)["\']?\)')
+
+# 小红书时间格式（一次扫描同时识别格式并提取数字，按 lastgroup 分派）
+_RE_XHS_DATE = re.compile(
+    r"(?P<full>(?P<year>\d{4})[-年](?P<full_month>\d{1,2})[-月](?P<full_day>\d{1,2})日?)"
+    r"|(?P<month_day>(?P<month>\d{1,2})[-月](?P<day>\d{1,2})日?)"
+    r"|(?P<just_now>刚刚)"
+    r"|(?P<minutes_ago>\d+)\s*分钟前"
+    r"|(?P<hours_ago>\d+)\s*小时前"
+    r"|(?P<days_ago>\d+)\s*天前"
+    r"|(?P<yesterday>昨天)"
+    r"|(?P<day_before>前天)"
+)
+
+# 北京时间
+_CST = timezone(timedelta(hours=8))
+
+_BASE_URL_STRIPPED = BASE_URL.rstrip("/")
+
+# 笔记 URL 格式（合并为一个正则，一次扫描）
+# https://www.xiaohongshu.com/explore/xxx
+# https://www.xiaohongshu.com/search_result/xxx
+# https://www.xiaohongshu.com/discovery/item/xxx
+# ...?note_id=xxx
+_RE_NOTE_ID = re.compile(
+    r"(?:/explore/|/discovery/item/|/search_result/|note_id=)([a-zA-Z0-9]+)"
+)
+
+
+def _join_url(href: str) -> str:
+    """
+    把卡片链接拼接为完整 URL（常见的站内绝对路径直接拼接，跳过 urljoin 的完整解析）
+
+    Args:
+        href: 卡片链接（通常为 /explore/xxx）
+
+    Returns:
+        str: 完整 URL
+    """
+    if href.startswith("https://") or href.startswith("http://"):
+        return href
+    if href.startswith("/") and not href.startswith("//"):
+        return _BASE_URL_STRIPPED + href
+    return urljoin(BASE_URL, href)
+
+
+def extract_note_cards_from_api(payload: Dict) -> List[Dict]:
+    """
+    从笔记列表接口的 JSON 响应中提取卡片数据
+
+    字段与 extract_all_note_cards 的输出保持一致，可以直接替换 DOM 提取结果
+
+    Args:
+        payload: 接口响应 JSON（{"data": {"items": [...]}}）
+
+    Returns:
+        List[Dict]: 卡片数据列表
+    """
+    data = payload.get("data") if isinstance(payload, dict) else None
+    items = data.get("items") if isinstance(data, dict) else None
+    if not items:
+        return []
 
-from .config import BASE_URL, SELECTORS
+    processed = []
+    for item in items:
+        try:
+            note_id = item.get("id")
+            note_card = item.get("note_card")
+            if not note_id or not note_card:
+                continue
+
+            # 详情页需要 xsec_token，否则可能跳转到登录 / 404
+            xsec_token = item.get("xsec_token")
+            permalink = f"{BASE_URL}/explore/{note_id}"
+            if xsec_token:
+                permalink += f"?xsec_token={quote(xsec_token)}&xsec_source=pc_search"
+
+            result = {
+                "note_id": note_id,
+                "permalink": permalink,
+                "note_type": "video" if note_card.get("type") == "video" else "normal",
+            }
+
+            title = note_card.get("display_title") or note_card.get("title")
+            if title:
+                result["title"] = title
+
+            cover = note_card.get("cover") or {}
+            cover_url = cover.get("url_default") or cover.get("url")
+            if cover_url:
+                result["cover_url"] = cover_url
+
+            user = note_card.get("user") or {}
+            author_name = user.get("nickname") or user.get("nick_name")
+            if author_name:
+                result["author_name"] = author_name
+            if user.get("avatar"):
+                result["author_avatar"] = user["avatar"]
+
+            # 数值字段为整数时直接使用，仅 "1.2万" 这类字符串才需要解析
+            liked = (note_card.get("interact_info") or {}).get("liked_count")
+            if isinstance(liked, int):
+                result["like_count"] = liked
+            elif liked:
+                result["like_count"] = parse_count(str(liked))
+
+            processed.append(result)
+
+        except Exception:
+            continue
+
+    return processed
+
+
+# 在浏览器中提取单张卡片的字段（extract_all_note_cards / extract_note_cards_batch 共用）
+_NOTE_CARD_JS = """
+(el) => {
+    const result = {};
+
+    // 提取链接
+    const link = el.tagName === 'A' ? el : el.querySelector('a');
+    if (link) {
+        result.href = link.getAttribute('href') || '';
+    }
+
+    // 提取标题
+    const titleEl = el.querySelector('.title, .note-title, span.title, [class*="title"]');
+    if (titleEl) {
+        result.title = titleEl.innerText?.trim() || '';
+    }
+
+    // 提取封面图
+    const img = el.querySelector('img');
+    if (img) {
+        result.cover_url = img.getAttribute('src') || img.getAttribute('data-src') || '';
+    }
+
+    // 提取作者
+    const authorEl = el.querySelector('.author .name, .user-name, .author-wrapper .name, [class*="author"] [class*="name"]');
+    if (authorEl) {
+        result.author_name = authorEl.innerText?.trim() || '';
+    }
+
+    // 提取点赞数
+    const likeEl = el.querySelector('[class*="like"] span, .like-count, .like .count, [class*="like"] [class*="count"]');
+    if (likeEl) {
+        result.like_text = likeEl.innerText?.trim() || '';
+    }
+
+    // 判断是否是视频
+    const videoIcon = el.querySelector('[class*="video"], .video-icon, svg.video');
+    result.is_video = !!videoIcon;
+
+    return result;
+}
+"""
+
+# 页面上所有笔记卡片
+_ALL_NOTE_CARDS_JS = (
+    """
+() => {
+    const extractCard = """
+    + _NOTE_CARD_JS
+    + """;
+    const cards = document.querySelectorAll(
+        'section.note-item, .note-item, [class*="note-item"], a[href*="/explore/"]'
+    );
+    const results = [];
+    cards.forEach((el) => {
+        try {
+            const result = extractCard(el);
+            // 只添加有效的卡片
+            if (result.href) results.push(result);
+        } catch (e) {
+            // 忽略单个卡片错误
+        }
+    });
+    return results;
+}
+"""
+)
+
+# 指定的卡片元素列表（一次 evaluate 处理全部句柄）
+_NOTE_CARDS_BATCH_JS = (
+    """
+(els) => {
+    const extractCard = """
+    + _NOTE_CARD_JS
+    + """;
+    return els.map((el) => {
+        try {
+            return extractCard(el);
+        } catch (e) {
+            return {};
+        }
+    });
+}
+"""
+)
+
+
+def _process_card_data(data: Dict) -> Optional[Dict]:
+    """
+    把浏览器返回的原始卡片字段转换为帖子数据
+
+    Args:
+        data: _NOTE_CARD_JS 的返回值
+
+    Returns:
+        Optional[Dict]: 卡片数据，没有笔记 ID 时返回 None
+    """
+    result = {}
+
+    # 处理链接和笔记 ID
+    href = data.get("href", "")
+    if href:
+        result["permalink"] = _join_url(href)
+        result["note_id"] = extract_note_id_from_url(href)
+
+    # 其他字段
+    if data.get("title"):
+        result["title"] = data["title"]
+    if data.get("cover_url"):
+        result["cover_url"] = data["cover_url"]
+    if data.get("author_name"):
+        result["author_name"] = data["author_name"]
+    if data.get("like_text"):
+        result["like_count"] = parse_count(data["like_text"])
+
+    result["note_type"] = "video" if data.get("is_video") else "normal"
+
+    return result if result.get("note_id") else None
 
 
 def extract_all_note_cards(page: "Page") -> List[Dict]:
@@ -31,102 +264,59 @@ def extract_all_note_cards(page: "Page") -> List[Dict]:
         List[Dict]: 所有卡片数据列表
     """
     try:
-        cards_data = page.evaluate("""
-            () => {
-                const cards = document.querySelectorAll(
-                    'section.note-item, .note-item, [class*="note-item"], a[href*="/explore/"]'
-                );
-                
-                const results = [];
-                
-                cards.forEach((el) => {
-                    try {
-                        const result = {};
-                        
-                        // 提取链接
-                        const link = el.tagName === 'A' ? el : el.querySelector('a');
-                        if (link) {
-                            result.href = link.getAttribute('href') || '';
-                        }
-                        
-                        // 提取标题
-                        const titleEl = el.querySelector('.title, .note-title, span.title, [class*="title"]');
-                        if (titleEl) {
-                            result.title = titleEl.innerText?.trim() || '';
-                        }
-                        
-                        // 提取封面图
-                        const img = el.querySelector('img');
-                        if (img) {
-                            result.cover_url = img.getAttribute('src') || img.getAttribute('data-src') || '';
-                        }
-                        
-                        // 提取作者
-                        const authorEl = el.querySelector('.author .name, .user-name, .author-wrapper .name, [class*="author"] [class*="name"]');
-                        if (authorEl) {
-                            result.author_name = authorEl.innerText?.trim() || '';
-                        }
-                        
-                        // 提取点赞数
-                        const likeEl = el.querySelector('[class*="like"] span, .like-count, .like .count, [class*="like"] [class*="count"]');
-                        if (likeEl) {
-                            result.like_text = likeEl.innerText?.trim() || '';
-                        }
-                        
-                        // 判断是否是视频
-                        const videoIcon = el.querySelector('[class*="video"], .video-icon, svg.video');
-                        result.is_video = !!videoIcon;
-                        
-                        // 只添加有效的卡片
-                        if (result.href) {
-                            results.push(result);
-                        }
-                    } catch (e) {
-                        // 忽略单个卡片错误
-                    }
-                });
-                
-                return results;
-            }
-        """)
-        
-        # 处理提取的数据
-        processed = []
-        for data in (cards_data or []):
-            try:
-                result = {}
-                
-                # 处理链接和笔记 ID
-                href = data.get("href", "")
-                if href:
-                    result["permalink"] = urljoin(BASE_URL, href)
-                    result["note_id"] = extract_note_id_from_url(href)
-                
-                # 其他字段
-                if data.get("title"):
-                    result["title"] = data["title"]
-                if data.get("cover_url"):
-                    result["cover_url"] = data["cover_url"]
-                if data.get("author_name"):
-                    result["author_name"] = data["author_name"]
-                if data.get("like_text"):
-                    result["like_count"] = parse_count(data["like_text"])
-                
-                result["note_type"] = "video" if data.get("is_video") else "normal"
-                
-                if result.get("note_id"):
-                    processed.append(result)
-                    
-            except Exception:
-                continue
-                
-        return processed
-        
+        cards_data = page.evaluate(_ALL_NOTE_CARDS_JS)
     except Exception as e:
         print(f"⚠️ 批量提取卡片失败: {e}")
         return []
 
+    processed = []
+    for data in cards_data or []:
+        try:
+            result = _process_card_data(data)
+            if result:
+                processed.append(result)
+        except Exception:
+            continue
+
+    return processed
+
+
+def extract_note_cards_batch(page: "Page", cards: List["ElementHandle"]) -> List[Dict]:
+    """
+    批量提取指定卡片元素的信息（所有句柄在一次 evaluate 中处理）
+
+    Args:
+        page: Playwright 页面对象
+        cards: 笔记卡片 DOM 元素列表
+
+    Returns:
+        List[Dict]: 卡片数据列表（无法识别笔记 ID 的卡片被跳过）
+    """
+    if not cards:
+        return []
+
+    try:
+        cards_data = page.evaluate(_NOTE_CARDS_BATCH_JS, cards)
+    except Exception as e:
+        # 静默处理常见的元素失效错误
+        error_str = str(e)
+        if "Cannot find context" not in error_str and "Target closed" not in error_str:
+            print(f"⚠️ 批量提取卡片失败: {e}")
+        return []
+
+    processed = []
+    for data in cards_data or []:
+        try:
+            result = _process_card_data(data)
+            if result:
+                processed.append(result)
+        except Exception:
+            continue
+
+    return processed
+
 
+@lru_cache(maxsize=4096)
 def parse_count(text: str) -> int:
     """
     解析小红书的数量文本，如 "1.2万", "5432", "10万+"
@@ -140,33 +330,49 @@ def parse_count(text: str) -> int:
     if not text:
         return 0
     try:
-        text = text.strip().replace(",", "").replace("+", "")
+        text = text.strip().translate(_COUNT_STRIP_TABLE)
+
+        # 纯数字（最常见的情况，无需正则）
+        if text.isdigit():
+            return int(text)
 
         # 处理中文数量
         if "万" in text:
-            num = float(text.replace("万", ""))
-            return int(num * 10000)
+            return _scale_decimal(text.replace("万", ""), 10000)
         elif "亿" in text:
-            num = float(text.replace("亿", ""))
-            return int(num * 100000000)
+            return _scale_decimal(text.replace("亿", ""), 100000000)
 
         # 处理英文数量
-        match = re.search(r"([\d.]+)\s*([KMB])?", text, re.IGNORECASE)
+        match = _RE_EN_COUNT.search(text)
         if match:
-            num = float(match.group(1))
             suffix = match.group(2)
-            if suffix:
-                suffix = suffix.upper()
-                multipliers = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
-                num *= multipliers.get(suffix, 1)
-            return int(num)
-
-        # 纯数字
-        return int(float(text))
+            multiplier = _EN_COUNT_MULTIPLIERS[suffix.upper()] if suffix else 1
+            return _scale_decimal(match.group(1), multiplier)
+
+        # 不含数字
+        return 0
     except Exception:
         return 0
 
 
+def _scale_decimal(num_text: str, multiplier: int) -> int:
+    """
+    用整数运算计算 "1.2" × multiplier（避免 float 误差，如 0.29万 → 2899）
+
+    Args:
+        num_text: 十进制数字文本
+        multiplier: 倍数
+
+    Returns:
+        int: 计算结果（向下取整）
+    """
+    whole, _, frac = num_text.partition(".")
+    if not frac:
+        return int(whole) * multiplier
+    scale = 10 ** len(frac)
+    return (int(whole or 0) * scale + int(frac)) * multiplier // scale
+
+
 def parse_xhs_date(date_text: str) -> Optional[str]:
     """
     解析小红书的时间格式
@@ -191,67 +397,80 @@ def parse_xhs_date(date_text: str) -> Optional[str]:
     if not date_text:
         return None
 
-    date_text = date_text.strip()
-    now = datetime.now(timezone(timedelta(hours=8)))  # 北京时间
+    # 相对时间以分钟为粒度计算，同一分钟内相同文本直接命中缓存
+    return _parse_xhs_date_at(date_text.strip(), int(time.time() // 60))
 
-    try:
-        # 刚刚
-        if "刚刚" in date_text:
-            return now.isoformat()
 
-        # X分钟前
-        if "分钟前" in date_text:
-            minutes = int(re.search(r"(\d+)", date_text).group(1))
-            return (now - timedelta(minutes=minutes)).isoformat()
-
-        # X小时前
-        if "小时前" in date_text:
-            hours = int(re.search(r"(\d+)", date_text).group(1))
-            return (now - timedelta(hours=hours)).isoformat()
-
-        # X天前
-        if "天前" in date_text:
-            days = int(re.search(r"(\d+)", date_text).group(1))
-            return (now - timedelta(days=days)).isoformat()
-
-        # 昨天
-        if "昨天" in date_text:
-            return (now - timedelta(days=1)).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ).isoformat()
+@lru_cache(maxsize=2)
+def _cst_now(minute: int) -> datetime:
+    """
+    返回给定分钟的北京时间（同一分钟内的所有卡片共用一个 datetime 对象）
 
-        # 前天
-        if "前天" in date_text:
-            return (now - timedelta(days=2)).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ).isoformat()
+    Args:
+        minute: Unix 时间戳 // 60
+
+    Returns:
+        datetime: 带时区的当前时间
+    """
+    return datetime.fromtimestamp(minute * 60, _CST)
 
-        # 完整日期格式: 2024-12-20 或 2024年12月20日
-        full_date_match = re.search(
-            r"(\d{4})[-年](\d{1,2})[-月](\d{1,2})日?", date_text
-        )
-        if full_date_match:
-            year, month, day = full_date_match.groups()
+
+@lru_cache(maxsize=4096)
+def _parse_xhs_date_at(date_text: str, minute: int) -> Optional[str]:
+    """
+    按给定的分钟时间点解析小红书时间文本（parse_xhs_date 的缓存实现）
+
+    Args:
+        date_text: 去除首尾空白的时间文本
+        minute: 当前时间（Unix 时间戳 // 60）
+
+    Returns:
+        Optional[str]: ISO 格式时间字符串
+    """
+    match = _RE_XHS_DATE.search(date_text)
+    if not match:
+        return None
+
+    kind = match.lastgroup
+
+    try:
+        # 完整日期格式: 2024-12-20 或 2024年12月20日（不依赖当前时间）
+        if kind == "full":
             return datetime(
-                int(year),
-                int(month),
-                int(day),
-                tzinfo=timezone(timedelta(hours=8)),
+                int(match["year"]),
+                int(match["full_month"]),
+                int(match["full_day"]),
+                tzinfo=_CST,
             ).isoformat()
 
+        now = _cst_now(minute)
+
         # 月日格式: 12-20 或 12月20日
-        month_day_match = re.search(r"(\d{1,2})[-月](\d{1,2})日?", date_text)
-        if month_day_match:
-            month, day = month_day_match.groups()
+        if kind == "month_day":
+            month = int(match["month"])
             year = now.year
             # 如果月份大于当前月份，说明是去年
-            if int(month) > now.month:
+            if month > now.month:
                 year -= 1
-            return datetime(
-                year, int(month), int(day), tzinfo=timezone(timedelta(hours=8))
-            ).isoformat()
+            return datetime(year, month, int(match["day"]), tzinfo=_CST).isoformat()
 
-        return None
+        # 刚刚
+        if kind == "just_now":
+            return now.isoformat()
+
+        # X分钟前 / X小时前 / X天前
+        if kind == "minutes_ago":
+            return (now - timedelta(minutes=int(match[kind]))).isoformat()
+        if kind == "hours_ago":
+            return (now - timedelta(hours=int(match[kind]))).isoformat()
+        if kind == "days_ago":
+            return (now - timedelta(days=int(match[kind]))).isoformat()
+
+        # 昨天 / 前天
+        days = 1 if kind == "yesterday" else 2
+        return (now - timedelta(days=days)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ).isoformat()
     except Exception:
         return None
 
@@ -269,121 +488,159 @@ def extract_note_id_from_url(url: str) -> Optional[str]:
     if not url:
         return None
 
-    # 匹配多种 URL 格式
-    # https://www.xiaohongshu.com/explore/xxx
-    # https://www.xiaohongshu.com/search_result/xxx
-    # https://www.xiaohongshu.com/discovery/item/xxx
-    patterns = [
-        r"/explore/([a-zA-Z0-9]+)",
-        r"/discovery/item/([a-zA-Z0-9]+)",
-        r"/search_result/([a-zA-Z0-9]+)",
-        r"note_id=([a-zA-Z0-9]+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-
-    return None
-
-
-def extract_note_card(card: "ElementHandle") -> Optional[Dict]:
-    """
-    从笔记卡片元素中提取信息（使用 evaluate 避免元素失效问题）
-
-    Args:
-        card: 笔记卡片 DOM 元素
-
-    Returns:
-        Optional[Dict]: 提取的信息，如果失败返回 None
-    """
-    if not card:
-        return None
-
-    try:
-        # 使用 evaluate 在浏览器中直接执行 JS，避免元素句柄失效问题
-        data = card.evaluate("""
-            (el) => {
-                const result = {};
-                
-                // 提取链接
-                const link = el.querySelector('a');
-                if (link) {
-                    result.href = link.getAttribute('href') || '';
-                }
-                
-                // 提取标题
-                const titleEl = el.querySelector('.title, .note-title, span.title, [class*="title"]');
-                if (titleEl) {
-                    result.title = titleEl.innerText?.trim() || '';
-                }
-                
-                // 提取封面图
-                const img = el.querySelector('img');
-                if (img) {
-                    result.cover_url = img.getAttribute('src') || img.getAttribute('data-src') || '';
-                }
-                
-                // 提取作者
-                const authorEl = el.querySelector('.author .name, .user-name, .author-wrapper .name, [class*="author"] [class*="name"]');
-                if (authorEl) {
-                    result.author_name = authorEl.innerText?.trim() || '';
-                }
-                
-                // 提取点赞数
-                const likeEl = el.querySelector('[class*="like"] span, .like-count, .like .count, [class*="like"] [class*="count"]');
-                if (likeEl) {
-                    result.like_text = likeEl.innerText?.trim() || '';
-                }
-                
-                // 判断是否是视频
-                const videoIcon = el.querySelector('[class*="video"], .video-icon, svg.video');
-                result.is_video = !!videoIcon;
-                
-                return result;
+    match = _RE_NOTE_ID.search(url)
+    return match.group(1) if match else None
+
+
+# 详情页各字段的候选选择器（按优先级）
+_DETAIL_SELECTORS = {
+    "title": ("#detail-title", ".title", "h1.title", ".note-title", '[class*="title"]'),
+    "content": (
+        "#detail-desc .desc",
+        ".note-text",
+        ".content .desc",
+        '[class*="desc"]',
+        ".note-content",
+    ),
+    "author": (".user-info .name", ".author .name", ".user-name", '[class*="nickname"]'),
+    "avatar": (".user-info img", ".author img", ".avatar img", '[class*="avatar"] img'),
+    "like": (".like-wrapper .count", '[class*="like"] .count', '[class*="like"] span'),
+    "collect": (
+        ".collect-wrapper .count",
+        '[class*="collect"] .count',
+        '[class*="collect"] span',
+    ),
+    "comment": (
+        ".comment-wrapper .count",
+        '[class*="comment"] .count',
+        '[class*="chat"] .count',
+    ),
+    "images": (
+        # 轮播图/幻灯片
+        ".swiper-slide img",
+        ".carousel img",
+        '[class*="swiper"] img',
+        '[class*="slider"] img',
+        # 图片容器
+        ".image-container img",
+        ".note-image img",
+        ".note-content img",
+        '[class*="image-box"] img',
+        '[class*="img-container"] img',
+        # 主图区域
+        ".main-image img",
+        ".media-container img",
+        '[class*="media"] img',
+        # 通用图片 (最后尝试)
+        ".note-scroller img",
+        "#noteContainer img",
+        '[class*="note"] img:not(.avatar):not([class*="user"])',
+    ),
+    "video": ("video, video source",),
+    # 以下两项收集所有匹配元素、不分优先级，合并为一个选择器只遍历一次 DOM
+    "background_images": '.swiper-slide, [class*="slide"], .image-item',
+    "tags": '.tag, .hashtag, #hash-tag span, a[href*="/search_result?keyword"]',
+    "time": (".date", ".time", ".publish-date", '[class*="time"]', '[class*="date"]'),
+}
+
+# 在浏览器中一次性提取详情页所有字段（避免每个选择器一次 IPC 往返）
+_NOTE_DETAIL_JS = """
+(sel) => {
+    const first = (selectors) => {
+        for (const s of selectors) {
+            const el = document.querySelector(s);
+            if (el) return el;
+        }
+        return null;
+    };
+    const text = (el) => (el && el.innerText ? el.innerText.trim() : '');
+    const result = {};
+
+    // 标题：取第一个长度大于 2 的候选
+    for (const s of sel.title) {
+        const t = text(document.querySelector(s));
+        if (t.length > 2) { result.title = t; break; }
+    }
+
+    // 内容：取第一个非空候选
+    for (const s of sel.content) {
+        const t = text(document.querySelector(s));
+        if (t) { result.content = t; break; }
+    }
+
+    const author = first(sel.author);
+    if (author) result.author_name = text(author);
+
+    const avatar = first(sel.avatar);
+    if (avatar) result.author_avatar = avatar.getAttribute('src');
+
+    // 互动数据（文本交给 Python 的 parse_count 解析）
+    for (const key of ['like', 'collect', 'comment']) {
+        const el = first(sel[key]);
+        if (el) result[key + '_text'] = el.innerText || '';
+    }
+
+    // 图片：按优先级尝试，找到即停止（Set 去重，保持顺序）
+    const images = [];
+    const seenImages = new Set();
+    const skip = /avatar|user|icon|emoji|logo/i;
+    for (const s of sel.images) {
+        for (const img of document.querySelectorAll(s)) {
+            let src = img.getAttribute('src') || img.getAttribute('data-src')
+                || img.getAttribute('data-original') || img.getAttribute('data-lazy-src');
+            if (!src) continue;
+            // 过滤头像和小图标
+            if (skip.test(src)) continue;
+            // 过滤 base64 占位图
+            if (src.startsWith('data:')) continue;
+            // 尝试获取高清版本
+            if (src.includes('thumbnail') || src.includes('small')) {
+                src = src.split('thumbnail').join('original').split('small').join('large');
             }
-        """)
-
-        if not data:
-            return None
-
-        # 处理提取的数据
-        result = {}
-
-        # 处理链接和笔记 ID
-        href = data.get("href", "")
-        if href:
-            result["permalink"] = urljoin(BASE_URL, href)
-            result["note_id"] = extract_note_id_from_url(href)
-
-        # 其他字段
-        if data.get("title"):
-            result["title"] = data["title"]
-        if data.get("cover_url"):
-            result["cover_url"] = data["cover_url"]
-        if data.get("author_name"):
-            result["author_name"] = data["author_name"]
-        if data.get("like_text"):
-            result["like_count"] = parse_count(data["like_text"])
-
-        result["note_type"] = "video" if data.get("is_video") else "normal"
-
-        return result if result.get("note_id") or result.get("title") else None
-
-    except Exception as e:
-        # 静默处理常见的元素失效错误
-        error_str = str(e)
-        if "Cannot find context" in error_str or "Target closed" in error_str:
-            return None
-        print(f"⚠️ 提取笔记卡片失败: {e}")
-        return None
+            if (!seenImages.has(src)) { seenImages.add(src); images.push(src); }
+        }
+        if (images.length) break;
+    }
+    result.image_urls = images;
+
+    // 没找到图片时返回背景图样式，由 Python 解析 url(...)
+    if (!images.length) {
+        result.background_styles = [];
+        for (const el of document.querySelectorAll(sel.background_images)) {
+            const style = el.getAttribute('style');
+            if (style) result.background_styles.push(style);
+        }
+    }
+
+    const video = first(sel.video);
+    if (video) result.video_url = video.getAttribute('src');
+
+    // 标签：收集所有候选（按 DOM 顺序）
+    const tags = new Set();
+    for (const el of document.querySelectorAll(sel.tags)) {
+        const t = text(el).replace(/^#+/, '');
+        if (t) tags.add(t);
+    }
+    result.tags = [...tags];
+
+    // 发布时间：返回每个候选的文本，由 Python 依次尝试解析
+    result.time_texts = [];
+    for (const s of sel.time) {
+        const el = document.querySelector(s);
+        if (el) result.time_texts.push(text(el));
+    }
+
+    return result;
+}
+"""
 
 
 def extract_note_detail(page: "Page") -> Dict:
     """
     从笔记详情页面提取完整信息
 
+    所有 DOM 读取在一次 page.evaluate 中完成，Python 端只做文本解析
+
     Args:
         page: Playwright 页面对象
 
@@ -398,218 +655,50 @@ def extract_note_detail(page: "Page") -> Dict:
     except Exception:
         pass
 
-    # 提取标题
-    try:
-        title_selectors = [
-            "#detail-title",
-            ".title",
-            "h1.title",
-            ".note-title",
-            '[class*="title"]',
-        ]
-        for selector in title_selectors:
-            el = page.query_selector(selector)
-            if el:
-                text = el.inner_text().strip()
-                if text and len(text) > 2:
-                    data["title"] = text
-                    break
-    except Exception:
-        pass
-
-    # 提取内容
-    try:
-        content_selectors = [
-            "#detail-desc .desc",
-            ".note-text",
-            ".content .desc",
-            '[class*="desc"]',
-            ".note-content",
-        ]
-        for selector in content_selectors:
-            el = page.query_selector(selector)
-            if el:
-                text = el.inner_text().strip()
-                if text:
-                    data["content"] = text
-                    break
-    except Exception:
-        pass
-
-    # 提取作者信息
-    try:
-        author_selectors = [".user-info .name", ".author .name", ".user-name", '[class*="nickname"]']
-        for selector in author_selectors:
-            el = page.query_selector(selector)
-            if el:
-                data["author_name"] = el.inner_text().strip()
-                break
-    except Exception:
-        pass
-
-    # 提取作者头像
-    try:
-        avatar_selectors = [".user-info img", ".author img", ".avatar img", '[class*="avatar"] img']
-        for selector in avatar_selectors:
-            el = page.query_selector(selector)
-            if el:
-                data["author_avatar"] = el.get_attribute("src")
-                break
-    except Exception:
-        pass
-
-    # 提取互动数据
-    try:
-        # 点赞
-        like_selectors = ['.like-wrapper .count', '[class*="like"] .count', '[class*="like"] span']
-        for selector in like_selectors:
-            el = page.query_selector(selector)
-            if el:
-                data["like_count"] = parse_count(el.inner_text())
-                break
-
-        # 收藏
-        collect_selectors = ['.collect-wrapper .count', '[class*="collect"] .count', '[class*="collect"] span']
-        for selector in collect_selectors:
-            el = page.query_selector(selector)
-            if el:
-                data["collect_count"] = parse_count(el.inner_text())
-                break
-
-        # 评论
-        comment_selectors = ['.comment-wrapper .count', '[class*="comment"] .count', '[class*="chat"] .count']
-        for selector in comment_selectors:
-            el = page.query_selector(selector)
-            if el:
-                data["comment_count"] = parse_count(el.inner_text())
-                break
-    except Exception:
-        pass
-
-    # 提取图片 - 增强版，多种选择器尝试
     try:
-        image_urls = []
-        
-        # 按优先级排序的图片选择器
-        img_selectors = [
-            # 轮播图/幻灯片
-            ".swiper-slide img",
-            ".carousel img",
-            '[class*="swiper"] img',
-            '[class*="slider"] img',
-            # 图片容器
-            ".image-container img",
-            ".note-image img",
-            ".note-content img",
-            '[class*="image-box"] img',
-            '[class*="img-container"] img',
-            # 主图区域
-            ".main-image img",
-            ".media-container img",
-            '[class*="media"] img',
-            # 通用图片 (最后尝试)
-            '.note-scroller img',
-            '#noteContainer img',
-            '[class*="note"] img:not(.avatar):not([class*="user"])',
-        ]
-        
-        for selector in img_selectors:
-            try:
-                images = page.query_selector_all(selector)
-                if images:
-                    for img in images:
-                        # 获取图片 URL（尝试多种属性）
-                        src = (
-                            img.get_attribute("src") 
-                            or img.get_attribute("data-src")
-                            or img.get_attribute("data-original")
-                            or img.get_attribute("data-lazy-src")
-                        )
-                        
-                        if not src:
-                            continue
-                            
-                        # 过滤头像和小图标
-                        if any(x in src.lower() for x in ["avatar", "user", "icon", "emoji", "logo"]):
-                            continue
-                            
-                        # 过滤 base64 占位图
-                        if src.startswith("data:"):
-                            continue
-                            
-                        # 尝试获取高清版本
-                        if "thumbnail" in src or "small" in src:
-                            src = src.replace("thumbnail", "original").replace("small", "large")
-                            
-                        if src and src not in image_urls:
-                            image_urls.append(src)
-                            
-                    # 找到图片就停止，避免重复
-                    if image_urls:
-                        break
-            except Exception:
-                continue
-                
-        # 如果上面没找到，尝试从背景图获取
-        if not image_urls:
-            try:
-                bg_selectors = ['.swiper-slide', '[class*="slide"]', '.image-item']
-                for selector in bg_selectors:
-                    els = page.query_selector_all(selector)
-                    for el in els:
-                        style = el.get_attribute("style") or ""
-                        bg_match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                        if bg_match:
-                            src = bg_match.group(1)
-                            if src and src not in image_urls and not src.startswith("data:"):
-                                image_urls.append(src)
-            except Exception:
-                pass
-                
-        if image_urls:
-            data["image_urls"] = image_urls
-            
-    except Exception:
-        pass
-
-    # 提取视频
-    try:
-        video = page.query_selector("video, video source")
-        if video:
-            data["video_url"] = video.get_attribute("src")
-            data["note_type"] = "video"
-    except Exception:
-        pass
-
-    # 提取标签
-    try:
-        tags = []
-        tag_selectors = [".tag", ".hashtag", "#hash-tag span", 'a[href*="/search_result?keyword"]']
-        for selector in tag_selectors:
-            tag_els = page.query_selector_all(selector)
-            if tag_els:
-                for tag_el in tag_els:
-                    tag_text = tag_el.inner_text().strip().lstrip("#")
-                    if tag_text and tag_text not in tags:
-                        tags.append(tag_text)
-        if tags:
-            data["tags"] = tags
-    except Exception:
-        pass
-
-    # 提取发布时间
-    try:
-        time_selectors = [".date", ".time", ".publish-date", '[class*="time"]', '[class*="date"]']
-        for selector in time_selectors:
-            el = page.query_selector(selector)
-            if el:
-                time_text = el.inner_text().strip()
-                parsed_time = parse_xhs_date(time_text)
-                if parsed_time:
-                    data["created_at"] = parsed_time
-                    break
-    except Exception:
-        pass
+        raw = page.evaluate(_NOTE_DETAIL_JS, _DETAIL_SELECTORS)
+    except Exception as e:
+        print(f"⚠️ 提取详情失败: {e}")
+        raw = {}
+
+    for key in ("title", "content", "author_name", "author_avatar"):
+        if key in raw:
+            data[key] = raw[key]
+
+    # 互动数据
+    for key in ("like", "collect", "comment"):
+        if f"{key}_text" in raw:
+            data[f"{key}_count"] = parse_count(raw[f"{key}_text"])
+
+    # 图片（没找到时尝试从背景图获取）
+    image_urls = raw.get("image_urls") or []
+    if not image_urls:
+        seen_urls: Set[str] = set()
+        for style in raw.get("background_styles") or []:
+            bg_match = _RE_BG_URL.search(style)
+            if bg_match:
+                src = bg_match.group(1)
+                if src and src not in seen_urls and not src.startswith("data:"):
+                    seen_urls.add(src)
+                    image_urls.append(src)
+    if image_urls:
+        data["image_urls"] = image_urls
+
+    # 视频
+    if "video_url" in raw:
+        data["video_url"] = raw["video_url"]
+        data["note_type"] = "video"
+
+    # 标签
+    if raw.get("tags"):
+        data["tags"] = raw["tags"]
+
+    # 发布时间
+    for time_text in raw.get("time_texts") or []:
+        parsed_time = parse_xhs_date(time_text)
+        if parsed_time:
+            data["created_at"] = parsed_time
+            break
 
     # 从 URL 提取笔记 ID
     try:
@@ -624,6 +713,12 @@ def extract_note_detail(page: "Page") -> Dict:
     return data
 
 
+# 合并时以详情页为准的字段
+_DETAIL_OVERRIDE_FIELDS = frozenset(
+    {"content", "image_urls", "tags", "like_count", "collect_count", "comment_count"}
+)
+
+
 def merge_note_data(card_data: Dict, detail_data: Dict) -> Dict:
     """
     合并卡片数据和详情数据
@@ -638,13 +733,11 @@ def merge_note_data(card_data: Dict, detail_data: Dict) -> Dict:
     merged = {**card_data}
 
     for key, value in detail_data.items():
-        # 详情页数据优先（通常更完整）
-        if value and (key not in merged or not merged[key]):
+        if not value:
+            continue
+        # 卡片缺少的字段用详情页补全；部分字段详情页数据更准确，直接覆盖
+        if key in _DETAIL_OVERRIDE_FIELDS or not merged.get(key):
             merged[key] = value
-        # 对于某些字段，详情页数据更准确
-        elif key in ["content", "image_urls", "tags", "like_count", "collect_count", "comment_count"]:
-            if value:
-                merged[key] = value
 
     return merged
 
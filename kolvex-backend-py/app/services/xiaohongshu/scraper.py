@@ -3,9 +3,11 @@
 """
 
 import random
+import threading
 import time
 import re
-from typing import List, Dict, Set, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Sequence, Set, Tuple, Optional
 from urllib.parse import quote, urljoin
 
 # Playwright 相关导入
@@ -22,30 +24,37 @@ from .config import (
     USER_AGENTS,
     BASE_URL,
     SEARCH_URL,
+    NOTE_FEED_API_PATHS,
     DEFAULT_MAX_POSTS,
     DEFAULT_DELAY_BETWEEN_POSTS,
     DEFAULT_DELAY_DURING_SCROLL,
     DEFAULT_MAX_SCROLLS,
+    DEFAULT_DETAIL_WORKERS,
+    DEFAULT_KEYWORD_WORKERS,
+    MAX_CONCURRENT_BROWSERS,
     PAGE_LOAD_TIMEOUT,
     ELEMENT_WAIT_TIMEOUT,
     NETWORK_IDLE_TIMEOUT,
     SETUP_LOGIN_TIMEOUT,
     BROWSER_ARGS,
+    BLOCKED_RESOURCE_TYPES,
     BROWSER_VIEWPORT,
     BROWSER_LOCALE,
     BROWSER_TIMEZONE,
-    SELECTORS,
+    VISIBLE_LOGIN_POPUP_SELECTOR,
+    SEARCH_RESULT_SELECTORS,
 )
 from .database import (
     get_supabase_client,
-    insert_post,
+    insert_posts_bulk,
     get_stats,
-    note_id_exists,
+    note_ids_exist,
+    warm_ai_analyzer,
 )
 from .extractors import (
-    extract_note_card,
     extract_note_detail,
     extract_all_note_cards,
+    extract_note_cards_from_api,
     merge_note_data,
     extract_note_id_from_url,
 )
@@ -119,6 +128,10 @@ class XiaohongshuScraper:
         delay_between_posts: Tuple[float, float] = DEFAULT_DELAY_BETWEEN_POSTS,
         delay_during_scroll: Tuple[float, float] = DEFAULT_DELAY_DURING_SCROLL,
         fetch_details: bool = True,
+        block_resources: bool = True,
+        detail_workers: int = DEFAULT_DETAIL_WORKERS,
+        keyword_workers: int = DEFAULT_KEYWORD_WORKERS,
+        max_browsers: int = MAX_CONCURRENT_BROWSERS,
     ):
         """
         初始化爬虫
@@ -130,6 +143,10 @@ class XiaohongshuScraper:
             delay_between_posts: 帖子间延迟范围 (min, max) 秒
             delay_during_scroll: 滚动时延迟范围 (min, max) 秒
             fetch_details: 是否抓取详情页（会更慢但数据更完整）
+            block_resources: 无头模式下是否拦截图片 / 视频 / 字体请求
+            detail_workers: 并行抓取详情页的浏览器数量（大于 1 时每批卡片的详情并行抓取）
+            keyword_workers: 并行爬取关键词的浏览器数量（大于 1 时关键词分配到多个浏览器）
+            max_browsers: 同时打开的浏览器总数上限（keyword_workers 和 detail_workers 按此裁剪）
         """
         if not PLAYWRIGHT_AVAILABLE:
             raise RuntimeError(
@@ -144,6 +161,29 @@ class XiaohongshuScraper:
         self.delay_between_posts = delay_between_posts
         self.delay_during_scroll = delay_during_scroll
         self.fetch_details = fetch_details
+        self.block_resources = block_resources
+        # 每个关键词会话占用一个浏览器，detail_workers > 1 时会话内再并行打开 detail_workers 个，
+        # 按 max_browsers 裁剪，避免两级并行相乘后浏览器数量失控
+        max_browsers = max(1, max_browsers)
+        self.keyword_workers = max(1, min(keyword_workers, max_browsers))
+        browsers_per_session = max_browsers // self.keyword_workers
+        self.detail_workers = max(1, detail_workers)
+        if self.detail_workers > 1:
+            self.detail_workers = min(self.detail_workers, browsers_per_session - 1)
+            if self.detail_workers < 2:
+                self.detail_workers = 1
+        if (self.keyword_workers, self.detail_workers) != (keyword_workers, detail_workers):
+            print(
+                f"⚠️ 浏览器总数上限为 {max_browsers}，并行数调整为: "
+                f"关键词 {self.keyword_workers}，详情 {self.detail_workers}"
+            )
+
+        # 多个浏览器并行时保护统计信息和 cookies 文件
+        self._lock = threading.Lock()
+        # 同一时间只允许一个浏览器等待扫码登录；登录完成后递增代数，
+        # 其他等待中的浏览器直接复用新 cookies，不再重复扫码
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
 
         # 统计信息
         self.stats = {
@@ -220,8 +260,7 @@ class XiaohongshuScraper:
                     input("👉 登录完成后，请在此处按【回车键】继续...")
 
                 # 保存 cookies
-                cookies = context.cookies()
-                if save_cookies(cookies, self.cookies_file):
+                if self._save_cookies(context):
                     print(f"✅ Cookies 已保存成功！文件路径: {self.cookies_file}")
                     return True
                 else:
@@ -239,11 +278,55 @@ class XiaohongshuScraper:
 
         return False
 
+    def _save_cookies(self, context) -> bool:
+        """
+        保存指定浏览器上下文的 cookies（多个浏览器并行时串行写文件）
+
+        Args:
+            context: 浏览器上下文
+
+        Returns:
+            bool: 保存成功返回 True
+        """
+        cookies = context.cookies()
+        with self._lock:
+            return save_cookies(cookies, self.cookies_file)
+
     def _wait_for_manual_login(self, context, page: "Page", timeout: int = 300) -> bool:
         """
         等待用户手动扫码登录
 
-        当检测到登录弹窗时，暂停爬取，等待用户扫码登录后继续
+        当检测到登录弹窗时，暂停爬取，等待用户扫码登录后继续。
+        多个浏览器并行时同一时间只有一个等待扫码，其余在锁上等待，
+        期间如果其他浏览器已完成登录，直接加载新保存的 cookies
+
+        Args:
+            context: 浏览器上下文（用于保存 / 加载 cookies）
+            page: Playwright 页面对象
+            timeout: 等待超时时间（秒）
+
+        Returns:
+            bool: 登录成功返回 True
+        """
+        generation = self._login_generation
+
+        with self._login_lock:
+            if self._login_generation != generation:
+                with self._lock:
+                    cookies = load_cookies(self.cookies_file)
+                if cookies:
+                    context.add_cookies(cookies)
+                    print("✅ 其他浏览器已完成登录，加载新的 cookies 继续爬取")
+                    return True
+
+            if self._do_manual_login(context, page, timeout):
+                self._login_generation += 1
+                return True
+            return False
+
+    def _do_manual_login(self, context, page: "Page", timeout: int) -> bool:
+        """
+        提示用户扫码并等待登录完成（调用方需持有 _login_lock）
 
         Args:
             context: 浏览器上下文（用于保存 cookies）
@@ -277,8 +360,7 @@ class XiaohongshuScraper:
                 input("👉 登录完成后，请在此处按【回车键】继续...")
 
             # 保存 cookies
-            cookies = context.cookies()
-            if save_cookies(cookies, self.cookies_file):
+            if self._save_cookies(context):
                 print(f"✅ Cookies 已保存！文件路径: {self.cookies_file}")
                 print("🚀 继续爬取...\n")
                 return True
@@ -300,21 +382,12 @@ class XiaohongshuScraper:
         Returns:
             bool: 需要登录返回 True
         """
-        # 检测登录弹窗选择器
-        login_popup_selectors = [
-            '[class*="login-modal"]',
-            '[class*="login-container"]',
-            '[class*="login-dialog"]',
-            '[class*="login-popup"]',
-        ]
-
-        for selector in login_popup_selectors:
-            try:
-                popup = page.query_selector(selector)
-                if popup and popup.is_visible():
-                    return True
-            except Exception:
-                continue
+        # 检测登录弹窗（任一候选可见即需要登录）
+        try:
+            if page.locator(VISIBLE_LOGIN_POPUP_SELECTOR).count() > 0:
+                return True
+        except Exception:
+            pass
 
         # 检查页面内容
         try:
@@ -377,6 +450,49 @@ class XiaohongshuScraper:
         """
         )
 
+    def _install_resource_blocker(self, page: "Page") -> None:
+        """
+        拦截不需要的资源请求（图片 URL 从 src 属性读取，不需要下载图片本身）
+
+        只在无头模式下启用：有头模式可能需要扫码登录，二维码本身是图片
+        """
+        if not (self.block_resources and self.headless):
+            return
+
+        def handle_route(route) -> None:
+            if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+                route.abort()
+            else:
+                route.continue_()
+
+        page.route("**/*", handle_route)
+
+    def _listen_note_feed_api(self, page: "Page", queue: List[Dict]):
+        """
+        监听笔记列表接口响应，把解析出的卡片追加到 queue
+
+        Args:
+            page: Playwright 页面对象
+            queue: 接收卡片数据的列表
+
+        Returns:
+            响应处理函数（用于 page.remove_listener）
+        """
+
+        def handle_response(response) -> None:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if not any(path in response.url for path in NOTE_FEED_API_PATHS):
+                return
+            try:
+                queue.extend(extract_note_cards_from_api(response.json()))
+            except Exception:
+                # 响应体不可读时退回 DOM 提取
+                pass
+
+        page.on("response", handle_response)
+        return handle_response
+
     def _build_search_url(self, keyword: str) -> str:
         """
         构建搜索 URL
@@ -390,7 +506,13 @@ class XiaohongshuScraper:
         encoded_keyword = quote(keyword)
         return f"{SEARCH_URL}?keyword={encoded_keyword}&source=unknown"
 
-    def _scrape_search_results(self, context, page: "Page", keyword: str) -> List[Dict]:
+    def _scrape_search_results(
+        self,
+        context,
+        page: "Page",
+        keyword: str,
+        detail_page: Optional["Page"] = None,
+    ) -> List[Dict]:
         """
         爬取搜索结果页面
 
@@ -398,6 +520,7 @@ class XiaohongshuScraper:
             context: 浏览器上下文（用于保存 cookies）
             page: Playwright 页面对象
             keyword: 搜索关键词
+            detail_page: 顺序抓取详情时使用的独立页面（搜索页保持滚动位置，无需来回跳转）
 
         Returns:
             List[Dict]: 爬取到的帖子列表
@@ -406,6 +529,10 @@ class XiaohongshuScraper:
         collected_posts = []
         seen_note_ids: Set[str] = set()
 
+        # 接口响应中的卡片（滚动加载时持续追加）
+        api_cards: List[Dict] = []
+        response_handler = self._listen_note_feed_api(page, api_cards)
+
         print(f"\n🔍 搜索关键词: {keyword}")
         print(f"   URL: {search_url}")
 
@@ -427,16 +554,8 @@ class XiaohongshuScraper:
             # 等待搜索结果加载
             try:
                 # 尝试多种选择器
-                selectors_to_try = [
-                    "section.note-item",
-                    ".note-item",
-                    '[class*="note-item"]',
-                    ".feeds-page section",
-                    'a[href*="/explore/"]',
-                ]
-
                 found = False
-                for selector in selectors_to_try:
+                for selector in SEARCH_RESULT_SELECTORS:
                     try:
                         page.wait_for_selector(
                             selector, timeout=ELEMENT_WAIT_TIMEOUT, state="visible"
@@ -461,7 +580,7 @@ class XiaohongshuScraper:
                         random_sleep(2, 3)
 
                         # 再次尝试查找内容
-                        for selector in selectors_to_try:
+                        for selector in SEARCH_RESULT_SELECTORS:
                             try:
                                 page.wait_for_selector(
                                     selector, timeout=5000, state="visible"
@@ -494,62 +613,94 @@ class XiaohongshuScraper:
             ):
                 scroll_count += 1
 
-                # 使用 JS 批量提取所有笔记卡片（避免元素失效问题）
-                cards_data = extract_all_note_cards(page)
+                # 优先使用拦截到的接口数据，没有时再用 JS 批量提取 DOM 卡片
+                if api_cards:
+                    cards_data = api_cards[:]
+                    api_cards.clear()
+                else:
+                    cards_data = extract_all_note_cards(page)
+
+                # 一次查询本批次中已入库的笔记，避免逐条查询数据库
+                existing_note_ids = set()
+                if self.supabase:
+                    existing_note_ids = note_ids_exist(
+                        self.supabase,
+                        {
+                            card["note_id"]
+                            for card in cards_data
+                            if card.get("note_id")
+                            and card["note_id"] not in seen_note_ids
+                        },
+                    )
 
                 new_in_batch = 0
 
+                # 筛选本批次需要处理的新卡片
+                pending_cards = []
                 for card_data in cards_data:
-                    if len(collected_posts) >= self.max_posts:
+                    if len(collected_posts) + len(pending_cards) >= self.max_posts:
                         break
 
-                    try:
-                        note_id = card_data.get("note_id")
-                        if not note_id or note_id in seen_note_ids:
-                            continue
+                    note_id = card_data.get("note_id")
+                    if not note_id or note_id in seen_note_ids:
+                        continue
 
-                        seen_note_ids.add(note_id)
-                        card_data["search_keyword"] = keyword
+                    seen_note_ids.add(note_id)
+                    card_data["search_keyword"] = keyword
 
-                        # 检查数据库是否已存在
-                        if self.supabase and note_id_exists(self.supabase, note_id):
-                            self.stats["posts_duplicate"] += 1
-                            continue
+                    # 检查数据库是否已存在
+                    if note_id in existing_note_ids:
+                        self._add_stat("posts_duplicate")
+                        continue
 
-                        # 是否获取详情
-                        if self.fetch_details and card_data.get("permalink"):
-                            print(
-                                f"   📖 [{len(collected_posts)+1}/{self.max_posts}] 获取: {card_data.get('title', '')[:30]}..."
-                            )
-                            detail_data = self._fetch_note_detail(
-                                context, page, card_data["permalink"]
-                            )
-                            if detail_data:
-                                card_data = merge_note_data(card_data, detail_data)
-                            random_sleep(*self.delay_between_posts)
-
-                        collected_posts.append(card_data)
-                        new_in_batch += 1
-
-                        # 保存到 Supabase（含 AI 分析）
-                        if self.supabase:
-                            inserted, post_id = insert_post(self.supabase, card_data)
-                            if inserted:
-                                self.stats["posts_new"] += 1
-                                print(
-                                    f"   ✅ [{len(collected_posts)}/{self.max_posts}] {card_data.get('title', '')[:40]}..."
-                                )
-                            else:
-                                self.stats["posts_duplicate"] += 1
-                        else:
+                    pending_cards.append(card_data)
+
+                # 多个 worker 时，整批详情页并行抓取
+                parallel_details = {}
+                if self.fetch_details and self.detail_workers > 1 and pending_cards:
+                    parallel_details = self.fetch_note_details(
+                        [c["permalink"] for c in pending_cards if c.get("permalink")]
+                    )
+
+                batch_posts = []
+                try:
+                    for card_data in pending_cards:
+                        try:
+                            # 是否获取详情
+                            if self.fetch_details and card_data.get("permalink"):
+                                if self.detail_workers > 1:
+                                    detail_data = parallel_details.get(card_data["permalink"])
+                                else:
+                                    print(
+                                        f"   📖 [{len(collected_posts)+1}/{self.max_posts}] 获取: {card_data.get('title', '')[:30]}..."
+                                    )
+                                    detail_data = self._fetch_note_detail(
+                                        context, detail_page or page, card_data["permalink"]
+                                    )
+                                    random_sleep(*self.delay_between_posts)
+                                if detail_data:
+                                    card_data = merge_note_data(card_data, detail_data)
+
+                            collected_posts.append(card_data)
+                            batch_posts.append(card_data)
+                            new_in_batch += 1
                             print(
                                 f"   📝 [{len(collected_posts)}/{self.max_posts}] {card_data.get('title', '')[:40]}..."
                             )
 
-                    except Exception as e:
-                        print(f"   ⚠️ 处理卡片失败: {e}")
-                        self.stats["posts_failed"] += 1
-                        continue
+                        except Exception as e:
+                            print(f"   ⚠️ 处理卡片失败: {e}")
+                            self._add_stat("posts_failed")
+                            continue
+                finally:
+                    # 整批保存到 Supabase（AI 分析并发执行，一次 upsert 写入）；中断时也保存已处理的帖子
+                    if self.supabase and batch_posts:
+                        inserted = insert_posts_bulk(
+                            self.supabase, batch_posts, check_exists=False
+                        )
+                        self._add_stat("posts_new", inserted)
+                        self._add_stat("posts_duplicate", len(batch_posts) - inserted)
+                        print(f"   ✅ 本批保存 {inserted}/{len(batch_posts)} 条新帖子")
 
                 if new_in_batch == 0:
                     no_new_count += 1
@@ -581,7 +732,7 @@ class XiaohongshuScraper:
                 except Exception:
                     pass
 
-            self.stats["posts_scraped"] += len(collected_posts)
+            self._add_stat("posts_scraped", len(collected_posts))
             print(f"\n   📊 关键词 '{keyword}': 爬取 {len(collected_posts)} 条帖子")
 
         except Exception as e:
@@ -592,6 +743,9 @@ class XiaohongshuScraper:
             except Exception:
                 pass
 
+        finally:
+            page.remove_listener("response", response_handler)
+
         return collected_posts
 
     def _fetch_note_detail(self, context, page: "Page", url: str) -> Optional[Dict]:
@@ -600,15 +754,12 @@ class XiaohongshuScraper:
 
         Args:
             context: 浏览器上下文（用于保存 cookies）
-            page: Playwright 页面对象
+            page: 详情页专用的 Playwright 页面对象
             url: 笔记详情页 URL
 
         Returns:
             Optional[Dict]: 详情数据
         """
-        # 保存当前 URL 以便返回
-        original_url = page.url
-
         try:
             page.goto(url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT)
             random_sleep(2, 4)
@@ -627,19 +778,102 @@ class XiaohongshuScraper:
             print(f"      ⚠️ 获取详情失败: {e}")
             return None
 
-        finally:
-            # 返回搜索结果页面
-            try:
-                page.goto(
-                    original_url,
-                    wait_until="domcontentloaded",
-                    timeout=PAGE_LOAD_TIMEOUT,
-                )
-                random_sleep(1, 2)
-            except Exception:
-                pass
+    def fetch_note_details(self, urls: Sequence[str]) -> Dict[str, Dict]:
+        """
+        使用多个独立浏览器并行抓取详情页
+
+        Playwright 同步 API 不能跨线程共享，每个 worker 线程启动自己的浏览器和上下文，
+        cookies 相互隔离，各自按 delay_between_posts 限速
+
+        Args:
+            urls: 详情页 URL 列表
+
+        Returns:
+            Dict[str, Dict]: URL -> 详情数据（抓取失败的 URL 不包含在内）
+        """
+        if not urls:
+            return {}
+
+        workers = min(self.detail_workers, len(urls))
+        chunks = [urls[i::workers] for i in range(workers)]
+        print(f"   📖 并行获取 {len(urls)} 条详情（{workers} 个浏览器）...")
+
+        results: Dict[str, Dict] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_results in executor.map(self._fetch_details_worker, chunks):
+                results.update(chunk_results)
+        return results
 
-    def scrape(self, keywords: List[str]) -> Dict:
+    def _fetch_details_worker(self, urls: Sequence[str]) -> Dict[str, Dict]:
+        """
+        在独立的浏览器中顺序抓取一组详情页（fetch_note_details 的 worker）
+
+        Args:
+            urls: 详情页 URL 列表
+
+        Returns:
+            Dict[str, Dict]: URL -> 详情数据
+        """
+        results = {}
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+                try:
+                    context = browser.new_context(
+                        user_agent=random.choice(USER_AGENTS),
+                        viewport=BROWSER_VIEWPORT,
+                        locale=BROWSER_LOCALE,
+                        timezone_id=BROWSER_TIMEZONE,
+                    )
+                    generation = self._login_generation
+                    with self._lock:
+                        cookies = load_cookies(self.cookies_file)
+                    if cookies:
+                        context.add_cookies(cookies)
+
+                    page = context.new_page()
+                    self._add_stealth_scripts(page)
+                    self._install_resource_blocker(page)
+
+                    for url in urls:
+                        try:
+                            page.goto(
+                                url,
+                                wait_until="domcontentloaded",
+                                timeout=PAGE_LOAD_TIMEOUT,
+                            )
+                            random_sleep(2, 4)
+                            if self._check_login_required(page):
+                                # worker 不弹出扫码；等待进行中的登录结束，
+                                # 如有其他浏览器完成了登录，加载新 cookies 后重试一次
+                                with self._login_lock:
+                                    refreshed = self._login_generation != generation
+                                    generation = self._login_generation
+                                if refreshed:
+                                    with self._lock:
+                                        cookies = load_cookies(self.cookies_file)
+                                    if cookies:
+                                        context.add_cookies(cookies)
+                                    page.goto(
+                                        url,
+                                        wait_until="domcontentloaded",
+                                        timeout=PAGE_LOAD_TIMEOUT,
+                                    )
+                                    random_sleep(1, 2)
+                                if not refreshed or self._check_login_required(page):
+                                    print(f"      ⚠️ 详情页需要登录，跳过: {url}")
+                                    continue
+                            results[url] = extract_note_detail(page)
+                        except Exception as e:
+                            print(f"      ⚠️ 获取详情失败: {e}")
+                        random_sleep(*self.delay_between_posts)
+                finally:
+                    browser.close()
+        except Exception as e:
+            print(f"      ⚠️ 详情 worker 启动失败: {e}")
+        return results
+
+    def scrape(self, keywords: Sequence[str]) -> Dict:
         """
         爬取多个关键词的搜索结果
 
@@ -668,6 +902,33 @@ class XiaohongshuScraper:
         print(f"💾 存储: {'Supabase' if self.supabase else '仅打印'}")
         print("=" * 60)
 
+        # 启动浏览器的同时检查 AI 服务
+        if self.supabase:
+            warm_ai_analyzer()
+
+        workers = min(self.keyword_workers, len(keywords))
+        if workers > 1:
+            # 关键词分配到多个浏览器并行爬取（同步 API 不能跨线程共享，每个线程独立启动浏览器）
+            print(f"🧵 使用 {workers} 个浏览器并行爬取关键词")
+            chunks = [list(keywords[i::workers]) for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda chunk: self._run_session(chunk, cookies), chunks))
+        else:
+            self._run_session(keywords, cookies)
+
+        # 打印最终统计
+        self._print_final_stats()
+
+        return self.stats
+
+    def _run_session(self, keywords: Sequence[str], cookies: Optional[List[Dict]]) -> None:
+        """
+        启动一个浏览器会话，顺序爬取给定的关键词
+
+        Args:
+            keywords: 本会话负责的关键词列表
+            cookies: 要加载的 cookies
+        """
         with sync_playwright() as p:
             browser = p.chromium.launch(
                 headless=self.headless,
@@ -687,16 +948,21 @@ class XiaohongshuScraper:
 
             page = context.new_page()
             self._add_stealth_scripts(page)
+            self._install_resource_blocker(page)
 
-            # 保存 context 引用供内部方法使用
-            self._current_context = context
+            # 顺序抓取详情时使用同一上下文中的第二个页面，搜索页不用再跳回和重新加载
+            detail_page = None
+            if self.fetch_details and self.detail_workers == 1:
+                detail_page = context.new_page()
+                self._add_stealth_scripts(detail_page)
+                self._install_resource_blocker(detail_page)
 
             try:
                 for i, keyword in enumerate(keywords, 1):
                     print(f"\n[{i}/{len(keywords)}] 🔎 关键词: {keyword}")
 
-                    self._scrape_search_results(context, page, keyword)
-                    self.stats["keywords_processed"] += 1
+                    self._scrape_search_results(context, page, keyword, detail_page)
+                    self._add_stat("keywords_processed")
 
                     # 关键词间延迟
                     if i < len(keywords):
@@ -711,17 +977,22 @@ class XiaohongshuScraper:
             finally:
                 # 更新 cookies
                 try:
-                    new_cookies = context.cookies()
-                    save_cookies(new_cookies, self.cookies_file)
+                    self._save_cookies(context)
                 except Exception:
                     pass
 
                 browser.close()
 
-        # 打印最终统计
-        self._print_final_stats()
+    def _add_stat(self, key: str, n: int = 1) -> None:
+        """
+        累加统计计数（线程安全）
 
-        return self.stats
+        Args:
+            key: 统计项
+            n: 增量
+        """
+        with self._lock:
+            self.stats[key] += n
 
     def _print_final_stats(self) -> None:
         """打印最终统计信息"""
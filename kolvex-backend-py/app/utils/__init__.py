@@ -0,0 +1,8 @@
+"""
+通用工具
+"""
+from app.utils.cache import TTLCache
+
+__all__ = [
+    "TTLCache",
+]
@@ -0,0 +1,56 @@
+"""
+进程内 TTL 缓存
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    简单的进程内 TTL + 容量上限缓存
+
+    - 读取时检查过期时间，过期条目视为未命中并移除
+    - 超过 maxsize 时按插入顺序淘汰最早的条目
+    - 读写加锁，可在同步路由（线程池）中共享使用
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取缓存值，未命中或已过期返回 None"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                self._data.pop(key, None)
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存值"""
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # dict 保持插入顺序，第一个即最早写入的条目
+                self._data.pop(next(iter(self._data)), None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        """移除缓存值（写操作后失效）"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
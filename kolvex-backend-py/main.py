@@ -3,14 +3,21 @@ Kolvex Backend API
 FastAPI 应用入口
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 
+import httpx
+from postgrest.exceptions import APIError
+
 # 导入路由和配置
 from app.api.routes import api_router
 from app.core.config import settings
+from app.core.postgres import PostgresPool, asyncpg
 
 # 配置日志
 logging.basicConfig(
@@ -124,6 +131,15 @@ async def lifespan(app: FastAPI):
     print(f"📝 API Version: {settings.APP_VERSION}")
     print(f"🌐 CORS Origins: {settings.ALLOWED_ORIGINS}")
 
+    # 同步 Supabase 调用经 asyncio.to_thread 卸载到默认线程池，
+    # 默认大小 min(32, CPU + 4) 在高并发下会排队，这里按预期并发调大
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.THREAD_POOL_WORKERS)
+    )
+
+    # 创建 Postgres 连接池（未配置时跳过）
+    await PostgresPool.init_pool()
+
     # 启动定时任务
     setup_scheduler()
 
@@ -131,6 +147,7 @@ async def lifespan(app: FastAPI):
 
     # 关闭时执行
     shutdown_scheduler()
+    await PostgresPool.close_pool()
     print("👋 Shutting down Kolvex Backend API...")
 
 
@@ -155,6 +172,29 @@ app.add_middleware(
 )
 
 
+async def data_layer_exception_handler(request: Request, exc: Exception):
+    """
+    统一处理数据层异常（PostgREST / Supabase 网络 / asyncpg）
+
+    服务层只抛出有业务含义的 HTTPException，数据层异常在这里记录并返回 500。
+    按具体异常类型注册（而不是 Exception），由 ExceptionMiddleware 处理，
+    响应位于 CORSMiddleware 之内，浏览器能拿到带 CORS 头的 JSON 错误
+    """
+    logger.exception(f"❌ 数据层异常: {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "internal server error"},
+    )
+
+
+DATA_LAYER_EXCEPTIONS = [APIError, httpx.HTTPError]
+if asyncpg is not None:
+    DATA_LAYER_EXCEPTIONS.append(asyncpg.PostgresError)
+
+for exc_class in DATA_LAYER_EXCEPTIONS:
+    app.add_exception_handler(exc_class, data_layer_exception_handler)
+
+
 @app.get("/")
 async def root():
     """根路径"""
@@ -0,0 +1,15 @@
+-- user_follows 复合索引
+-- 粉丝/关注列表按 (following_id | follower_id) 过滤并按 created_at 倒序分页，
+-- 复合索引可以直接按顺序读取，避免额外排序
+
+CREATE INDEX IF NOT EXISTS idx_user_follows_follower_created
+    ON user_follows(follower_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_user_follows_following_created
+    ON user_follows(following_id, created_at DESC);
+
+-- 单列索引已被上面的复合索引（前缀）覆盖
+DROP INDEX IF EXISTS idx_user_follows_follower_id;
+DROP INDEX IF EXISTS idx_user_follows_following_id;
+
+-- (follower_id, following_id) 的查找由 user_follows_unique 约束自带的唯一索引覆盖
@@ -0,0 +1,6 @@
+-- user_profiles 按创建时间排序的索引
+-- list_users 按 created_at DESC, id DESC 排序并以 created_at 作为 keyset 分页游标，
+-- 该索引让每一页都能直接从游标位置开始扫描，而不需要 OFFSET 跳过前面的行
+
+CREATE INDEX IF NOT EXISTS idx_user_profiles_created_at_id
+    ON user_profiles (created_at DESC, id DESC);
@@ -0,0 +1,11 @@
+-- user_profiles 搜索的 trigram 索引
+-- list_users 使用 email/username ILIKE '%keyword%' 搜索，前置通配符无法使用 btree 索引，
+-- pg_trgm 的 GIN 索引可以让这类查询走索引扫描
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_user_profiles_email_trgm
+    ON user_profiles USING gin (email gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_user_profiles_username_trgm
+    ON user_profiles USING gin (username gin_trgm_ops);
@@ -0,0 +1,62 @@
+-- 关注列表函数
+-- 一次调用返回分页后的粉丝/关注列表，包含用户资料、当前用户是否关注以及总数，
+-- 替代原先 get_followers / get_following 中的三次往返查询
+
+-- 粉丝列表: 关注 target 的用户
+CREATE OR REPLACE FUNCTION get_followers_page(target UUID, viewer UUID, lim INT, off INT)
+RETURNS TABLE (
+    user_id UUID,
+    username TEXT,
+    full_name TEXT,
+    avatar_url TEXT,
+    is_following BOOLEAN,
+    total BIGINT
+) AS $$
+    SELECT
+        uf.follower_id,
+        p.username::TEXT,
+        p.full_name::TEXT,
+        p.avatar_url::TEXT,
+        viewer IS NOT NULL AND EXISTS (
+            SELECT 1 FROM user_follows v
+            WHERE v.follower_id = viewer AND v.following_id = uf.follower_id
+        ),
+        COUNT(*) OVER ()
+    FROM user_follows uf
+    LEFT JOIN user_profiles p ON p.id = uf.follower_id
+    WHERE uf.following_id = target
+    ORDER BY uf.created_at DESC
+    LIMIT lim OFFSET off;
+$$ LANGUAGE sql STABLE;
+
+-- 关注列表: target 关注的用户
+CREATE OR REPLACE FUNCTION get_following_page(target UUID, viewer UUID, lim INT, off INT)
+RETURNS TABLE (
+    user_id UUID,
+    username TEXT,
+    full_name TEXT,
+    avatar_url TEXT,
+    is_following BOOLEAN,
+    total BIGINT
+) AS $$
+    SELECT
+        uf.following_id,
+        p.username::TEXT,
+        p.full_name::TEXT,
+        p.avatar_url::TEXT,
+        viewer IS NOT NULL AND (
+            viewer = target OR EXISTS (
+                SELECT 1 FROM user_follows v
+                WHERE v.follower_id = viewer AND v.following_id = uf.following_id
+            )
+        ),
+        COUNT(*) OVER ()
+    FROM user_follows uf
+    LEFT JOIN user_profiles p ON p.id = uf.following_id
+    WHERE uf.follower_id = target
+    ORDER BY uf.created_at DESC
+    LIMIT lim OFFSET off;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_followers_page(UUID, UUID, INT, INT) IS '分页获取粉丝列表（含资料与关注状态）';
+COMMENT ON FUNCTION get_following_page(UUID, UUID, INT, INT) IS '分页获取关注列表（含资料与关注状态）';
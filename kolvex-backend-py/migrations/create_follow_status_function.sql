@@ -0,0 +1,22 @@
+-- 关注状态函数
+-- 一次调用返回目标用户的粉丝数、关注数以及 viewer 是否关注了目标用户，
+-- 替代原先 get_follow_status 中的两次往返查询
+
+CREATE OR REPLACE FUNCTION get_follow_status(target UUID, viewer UUID)
+RETURNS TABLE (
+    followers_count INTEGER,
+    following_count INTEGER,
+    is_following BOOLEAN
+) AS $$
+    SELECT
+        COALESCE(p.followers_count, 0),
+        COALESCE(p.following_count, 0),
+        viewer IS NOT NULL AND viewer <> target AND EXISTS (
+            SELECT 1 FROM user_follows v
+            WHERE v.follower_id = viewer AND v.following_id = target
+        )
+    FROM user_profiles p
+    WHERE p.id = target;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION get_follow_status(UUID, UUID) IS '获取关注状态（粉丝数、关注数、是否关注）';
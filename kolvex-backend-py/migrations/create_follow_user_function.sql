@@ -0,0 +1,35 @@
+-- 关注用户函数
+-- 在一次调用中完成"是否已关注"和"目标用户是否存在"的检查并插入关注记录，
+-- 替代原先 follow_user 中的三次往返查询
+
+CREATE OR REPLACE FUNCTION follow_user_safe(f UUID, t UUID)
+RETURNS user_follows AS $$
+DECLARE
+    new_row user_follows;
+BEGIN
+    -- 目标用户不存在
+    IF NOT EXISTS (SELECT 1 FROM user_profiles WHERE id = t) THEN
+        RAISE EXCEPTION 'user not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    -- 已经关注（依赖 user_follows_unique 约束）
+    INSERT INTO user_follows (follower_id, following_id)
+    VALUES (f, t)
+    ON CONFLICT ON CONSTRAINT user_follows_unique DO NOTHING
+    RETURNING * INTO new_row;
+
+    IF new_row.id IS NULL THEN
+        RAISE EXCEPTION 'already follow this user' USING ERRCODE = '23505';
+    END IF;
+
+    RETURN new_row;
+END;
+$$ LANGUAGE plpgsql
+SET search_path = public;
+
+COMMENT ON FUNCTION follow_user_safe(UUID, UUID) IS '关注用户（存在性检查 + 插入，一次往返）';
+
+-- 关注者 ID 由参数传入，只允许后端（service_role）调用，
+-- 客户端通过 PostgREST 直接关注仍走 user_follows 的 RLS 策略
+REVOKE EXECUTE ON FUNCTION follow_user_safe(UUID, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION follow_user_safe(UUID, UUID) TO service_role;
@@ -0,0 +1,26 @@
+-- 批量获取用户资料及关注状态
+-- 一次调用返回指定用户的基本资料，以及 viewer 是否关注了他们，
+-- 替代"先查资料、再调用 check_batch_following"的两次往返
+
+CREATE OR REPLACE FUNCTION profiles_with_follow(viewer UUID, ids UUID[])
+RETURNS TABLE (
+    user_id UUID,
+    username TEXT,
+    full_name TEXT,
+    avatar_url TEXT,
+    is_following BOOLEAN
+) AS $$
+    SELECT
+        p.id,
+        p.username::TEXT,
+        p.full_name::TEXT,
+        p.avatar_url::TEXT,
+        viewer IS NOT NULL AND EXISTS (
+            SELECT 1 FROM user_follows v
+            WHERE v.follower_id = viewer AND v.following_id = p.id
+        )
+    FROM user_profiles p
+    WHERE p.id = ANY(ids);
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION profiles_with_follow(UUID, UUID[]) IS '批量获取用户资料及关注状态';
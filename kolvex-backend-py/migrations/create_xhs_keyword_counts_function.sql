@@ -0,0 +1,16 @@
+-- 小红书帖子按搜索关键词统计函数
+-- get_stats 原先拉取全表 search_keyword 再在 Python 中计数，
+-- 数据量随行数增长且受 PostgREST 最大返回行数限制；改为在数据库中 GROUP BY
+
+CREATE OR REPLACE FUNCTION xhs_keyword_counts()
+RETURNS TABLE (
+    keyword TEXT,
+    count BIGINT
+) AS $$
+    SELECT COALESCE(search_keyword, '未知')::TEXT AS keyword, COUNT(*) AS count
+    FROM xhs_posts
+    GROUP BY 1
+    ORDER BY 2 DESC;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION xhs_keyword_counts() IS '按搜索关键词统计小红书帖子数量';